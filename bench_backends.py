@@ -0,0 +1,95 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
+from bench_engines import HERE, wait_for_port
+from trafgen_backends import BACKENDS
+from trafgen_engine import build_parser, make_scheduler
+from trafgen_profile import RateProfile
+
+RATE_SOURCES = ('constant', 'poisson', 'onoff', 'profile')
+
+
+def bench_backend(name, url, args):
+    """Panggil fetch backend name berulang kali di satu thread tanpa penjadwal, executor atau log."""
+    backend_class = BACKENDS[name]
+    backend_args = build_parser(backend_class).parse_args(['-src', args.src] if name in ('source', 'icmp') else [])
+    backend_class.prepare(backend_args)
+    backend = backend_class(backend_args, seed=1)
+    backend.start()
+    try:
+        backend.fetch(url, backend.pick())
+        times = []
+        for _ in range(args.requests):
+            source = backend.pick()
+            start = time.perf_counter()
+            backend.fetch(url, source)
+            times.append(time.perf_counter() - start)
+    finally:
+        backend.close()
+    times = np.array(times) * 1000
+    print(f"{name:<10}{np.median(times):>12.3f}{np.percentile(times, 99):>12.3f}{len(times) / times.sum() * 1000:>12.1f}")
+
+
+def bench_rate_source(name, args):
+    """Waktu membangkitkan offset kirim per request untuk satu sumber rate, tanpa menunggu deadline-nya."""
+    rate_args = build_parser(BACKENDS['http']).parse_args(['-arrival', 'constant' if name == 'profile' else name])
+    if name == 'profile':
+        # Profil harian per menit seperti hasil forecast RF
+        minutes = np.arange(24 * 60)
+        rate = RateProfile.from_series(minutes * 60.0, 500 + 400 * np.sin(minutes / 229.0))
+    else:
+        rate = 1000.0
+    requests_per_second = rate.mean_rate if isinstance(rate, RateProfile) else rate
+    shard = {'requests_per_second': requests_per_second, 'seed': 1}
+    best = float('inf')
+    for _ in range(args.repeat):
+        scheduler = make_scheduler(rate_args, rate, shard)
+        start = time.perf_counter()
+        count = sum(1 for _ in islice(scheduler.offsets(args.offsets), args.offsets))
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<10}{best / count * 1e9:>12.1f}{count / best / 1e6:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark the hot path of each backend and rate source in isolation.')
+    parser.add_argument('-backends', nargs='+', choices=list(BACKENDS), default=['http', 'https', 'source'], help='Backends to benchmark (icmp needs ping sockets or CAP_NET_RAW)')
+    parser.add_argument('-rates', nargs='+', choices=RATE_SOURCES, default=list(RATE_SOURCES), help='Rate sources to benchmark')
+    parser.add_argument('-host', default='127.0.0.1', help='Address for the local origin')
+    parser.add_argument('-port', type=int, default=18180, help='Origin HTTP port (HTTPS uses port + 1)')
+    parser.add_argument('-assets', type=int, default=10, help='Sub-resources per page')
+    parser.add_argument('-src', default='127.0.0.1', help='Source IP for the source and icmp backends')
+    parser.add_argument('-requests', type=int, default=500, help='Sequential fetches per backend')
+    parser.add_argument('-offsets', type=int, default=1000000, help='Send offsets generated per rate source')
+    parser.add_argument('-repeat', type=int, default=5, help='Runs per rate source (best time is reported)')
+    args = parser.parse_args()
+
+    if args.backends:
+        command = [sys.executable, os.path.join(HERE, 'trafgen_origin.py'), '-host', args.host,
+                   '-port', str(args.port), '-https-port', str(args.port + 1), '-assets', str(args.assets)]
+        origin = subprocess.Popen(command, cwd=HERE, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_port(args.host, args.port)
+            wait_for_port(args.host, args.port + 1)
+            print(f"{'backend':<10}{'p50 ms':>12}{'p99 ms':>12}{'req/s':>12}")
+            for name in args.backends:
+                scheme, port = ('https', args.port + 1) if name == 'https' else ('http', args.port)
+                url = f"{scheme}://{args.host}:{port}/page/0.html" if name != 'icmp' else args.host
+                bench_backend(name, url, args)
+        finally:
+            origin.terminate()
+            origin.wait()
+
+    if args.rates:
+        print(f"{'rate':<10}{'ns/offset':>12}{'M/s':>12}")
+        for name in args.rates:
+            bench_rate_source(name, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import argparse
+import csv
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from trafgen_analyze import analyze_file
+from trafgen_origin import OriginConfig, page_urls, write_url_csv
+from trafgen_search import SLO, check_ramp, search
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Nama mode -> (skrip, argumen tambahan, file log yang ditulis skrip)
+ENGINES = {
+    'thread': ('trafgen-http.py', ['-engine', 'thread'], 'request_log_http.log'),
+    'async': ('trafgen-http.py', ['-engine', 'async'], 'request_log_http.log'),
+    'thread-fresh': ('trafgen-http.py', ['-engine', 'thread', '-conn', 'fresh'], 'request_log_http.log'),
+    'async-fresh': ('trafgen-http.py', ['-engine', 'async', '-conn', 'fresh'], 'request_log_http.log'),
+    'https-thread': ('trafgen-https.py', ['-engine', 'thread'], 'request_log_https.log'),
+    'https-async': ('trafgen-https.py', ['-engine', 'async'], 'request_log_https.log'),
+}
+RESULT_COLUMNS = ['engine', 'max_rps', 'cpu_ms_per_req', 'maxrss_mb', 'p99_ms', 'steps']
+
+
+def wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Origin tidak listen di {host}:{port} setelah {timeout:g} s")
+
+
+def start_origin(args):
+    command = [sys.executable, os.path.join(HERE, 'trafgen_origin.py'), '-host', args.host,
+               '-port', str(args.port), '-https-port', str(args.port + 1),
+               '-pages', str(args.pages), '-page-size', str(args.page_size), '-assets', str(args.assets),
+               '-asset-size', str(args.asset_size), '-delay', str(args.delay), '-jitter', str(args.jitter)]
+    origin = subprocess.Popen(command, cwd=HERE, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.host, args.port)
+        wait_for_port(args.host, args.port + 1)
+    except RuntimeError:
+        origin.kill()
+        raise
+    return origin
+
+
+def closed_port(host):
+    """Port di host yang baru saja dilepas, jadi koneksi ke sana ditolak."""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def run_step(engine, rate, args, workdir, duration=None):
+    """Jalankan skrip engine satu kali pada rate dan kembalikan baris kurva beserta CPU dan memori prosesnya."""
+    script, extra, log_name = ENGINES[engine]
+    num_requests = max(int(rate * (duration or args.duration)), 1)
+    command = [sys.executable, os.path.join(HERE, script), '-url', str(args.pages), '-req', str(num_requests),
+               '-rps', str(rate), '-zipf', '1', '1', '-seed', '1', '-quiet'] + extra
+    process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL)
+    # wait4 memberi rusage proses itu saja: CPU user+sys dan RSS maksimum
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{script} {' '.join(extra)} exited with {process.returncode}")
+
+    analysis = analyze_file(os.path.join(workdir, log_name))
+    overall = analysis.overall
+    duration = analysis.duration()
+    return {
+        'offered_rps': rate,
+        'achieved_rps': (overall.count - overall.errors) / duration if duration > 0 else 0.0,
+        'error_rate': overall.errors / overall.count if overall.count else 1.0,
+        'p99_ms': analysis.corrected.percentile(99),
+        'cpu_ms_per_req': (usage.ru_utime + usage.ru_stime) * 1000 / max(overall.count, 1),
+        'maxrss_mb': usage.ru_maxrss / 1024,
+    }
+
+
+def check_failing_step(engine, args, slo):
+    """Pastikan langkah ke origin yang menolak koneksi memang gagal SLO, supaya error tidak lolos diam-diam."""
+    with tempfile.TemporaryDirectory(prefix='trafgen-check-') as checkdir:
+        port = closed_port(args.host)
+        for name, scheme in (('url_bineca_http.csv', 'http'), ('url_bineca_https.csv', 'https')):
+            write_url_csv(os.path.join(checkdir, name), [f"{scheme}://{args.host}:{port}/page/0.html"])
+        point = run_step(engine, args.start, args, checkdir, duration=1.0)
+    reasons = slo.breaches(point)
+    if not reasons:
+        raise RuntimeError(f"{engine}: step against a refused origin passed the SLO "
+                           f"(errors {point['error_rate'] * 100:.2f}%), results would be meaningless")
+    print(f"Refused-origin check: {'; '.join(reasons)}")
+
+
+def bench_engine(engine, args, slo, workdir):
+    curve, best = search(lambda rate: run_step(engine, rate, args, workdir), slo, args.start, args.max,
+                         'bisect', args.factor, tolerance=args.tolerance, pause=args.pause)
+    result = {'engine': engine, 'max_rps': best or 0.0, 'cpu_ms_per_req': '', 'maxrss_mb': '', 'p99_ms': '',
+              'steps': len(curve)}
+    passed = [point for point in curve if point['offered_rps'] == best]
+    if passed:
+        result.update({name: passed[0][name] for name in ('cpu_ms_per_req', 'maxrss_mb', 'p99_ms')})
+    return result
+
+
+def compare(results, baseline_file, tolerance):
+    """Daftar regresi dibanding hasil sebelumnya: max_rps turun atau CPU/memori naik lebih dari tolerance."""
+    with open(baseline_file, newline='') as file:
+        baseline = {row['engine']: row for row in csv.DictReader(file)}
+    regressions = []
+    for result in results:
+        base = baseline.get(result['engine'])
+        if base is None:
+            continue
+        checks = [('max_rps', -1), ('cpu_ms_per_req', 1), ('maxrss_mb', 1)]
+        for name, direction in checks:
+            if result[name] == '' or base[name] == '':
+                continue
+            old, new = float(base[name]), float(result[name])
+            if old > 0 and (new - old) / old * direction > tolerance:
+                regressions.append(f"{result['engine']}: {name} {old:.3f} -> {new:.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark each traffic engine against a local synthetic origin.')
+    parser.add_argument('-engines', nargs='+', choices=list(ENGINES), default=list(ENGINES), help='Engine modes to benchmark')
+    parser.add_argument('-host', default='127.0.0.1', help='Address for the local origin')
+    parser.add_argument('-port', type=int, default=18080, help='Origin HTTP port (HTTPS uses port + 1)')
+    parser.add_argument('-pages', type=int, default=100, help='Pages served by the origin')
+    parser.add_argument('-page-size', type=int, default=20000, help='HTML size in bytes')
+    parser.add_argument('-assets', type=int, default=10, help='Sub-resources per page')
+    parser.add_argument('-asset-size', type=int, default=50000, help='Size of each sub-resource in bytes')
+    parser.add_argument('-delay', type=float, default=5.0, help='Fixed latency injected by the origin (ms)')
+    parser.add_argument('-jitter', type=float, default=2.0, help='Mean exponential latency injected by the origin (ms)')
+    parser.add_argument('-start', type=float, default=10.0, help='First offered rate (req/s)')
+    parser.add_argument('-max', type=float, default=100000.0, help='Highest offered rate tried (req/s)')
+    parser.add_argument('-factor', type=float, default=2.0, help='Rate multiplier between ramp steps')
+    parser.add_argument('-tolerance', type=float, default=0.1, help='Stop bisecting when the pass/fail bracket is narrower than this fraction')
+    parser.add_argument('-duration', type=float, default=5.0, help='Seconds per step')
+    parser.add_argument('-pause', type=float, default=1.0, help='Idle seconds between steps')
+    parser.add_argument('-slo-p99', type=float, default=500.0, help='Max p99 corrected latency in ms for a sustainable rate')
+    parser.add_argument('-slo-errors', type=float, default=0.01, help='Max error rate (fraction)')
+    parser.add_argument('-slo-achieved', type=float, default=0.95, help='Min achieved/offered rate ratio')
+    parser.add_argument('-out', default='bench_engines.csv', help='CSV file for the results')
+    parser.add_argument('-baseline', default=None, help='Earlier -out CSV to compare against; exits with status 1 on a regression')
+    parser.add_argument('-regress', type=float, default=0.1, help='Relative change counted as a regression')
+    args = parser.parse_args()
+    try:
+        check_ramp(args.start, args.factor, tolerance=args.tolerance)
+    except ValueError as e:
+        parser.error(str(e))
+
+    slo = SLO(args.slo_p99, args.slo_errors, args.slo_achieved)
+    config = OriginConfig(args.pages, args.page_size, args.assets, args.asset_size)
+    origin = start_origin(args)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='trafgen-bench-') as workdir:
+            write_url_csv(os.path.join(workdir, 'url_bineca_http.csv'),
+                          page_urls(f"http://{args.host}:{args.port}", config))
+            write_url_csv(os.path.join(workdir, 'url_bineca_https.csv'),
+                          page_urls(f"https://{args.host}:{args.port + 1}", config))
+            for engine in args.engines:
+                print(f"== {engine}")
+                check_failing_step(engine, args, slo)
+                results.append(bench_engine(engine, args, slo, workdir))
+    finally:
+        origin.terminate()
+        origin.wait()
+
+    with open(args.out, mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print(f"{'engine':<15}{'max rps':>10}{'CPU ms/req':>12}{'max RSS MB':>12}{'p99 ms':>10}{'steps':>7}")
+    for result in results:
+        values = [f"{result[name]:>{width}.2f}" if result[name] != '' else f"{'-':>{width}}"
+                  for name, width in (('cpu_ms_per_req', 12), ('maxrss_mb', 12), ('p99_ms', 10))]
+        print(f"{result['engine']:<15}{result['max_rps']:>10.2f}{''.join(values)}{result['steps']:>7}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.regress)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
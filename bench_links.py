@@ -0,0 +1,98 @@
+import argparse
+import re
+import time
+from urllib.parse import urljoin
+
+from trafgen_links import extract_links
+
+
+def find_links(html, base_url):
+    """Versi str.find lama dari skrip trafgen (disalin apa adanya untuk pembanding)."""
+    links = []
+    start = 0
+    while True:
+        start_link = html.find("src=\"", start)
+        if start_link == -1:
+            start_link = html.find("href=\"", start)
+        if start_link == -1:
+            break
+        start_quote = html.find("\"", start_link + 1)
+        end_quote = html.find("\"", start_quote + 1)
+        link = html[start_quote + 1: end_quote]
+        if link.startswith(("http", "//")):
+            links.append(link if link.startswith("http") else "http:" + link)
+        else:
+            links.append(urljoin(base_url, link))
+        start = end_quote + 1
+    return links
+
+
+def regex_links(html, base_url):
+    """Versi regex lama dari testing.py (disalin apa adanya untuk pembanding)."""
+    pattern = r'<img[^>]+src=["\'](.*?)["\']|<script[^>]+src=["\'](.*?)["\']|<link[^>]+href=["\'](.*?)["\']'
+    matches = re.findall(pattern, html, re.IGNORECASE)
+    links = set()
+    for match in matches:
+        for link in match:
+            if link:
+                absolute_link = urljoin(base_url, link)
+                links.add(absolute_link)
+    return links
+
+
+EXTRACTORS = {'str.find (old trafgen)': find_links, 'regex (old testing.py)': regex_links,
+              'trafgen_links': extract_links}
+
+
+def synthetic_page(size, resource_every=10):
+    """Halaman HTML kira-kira size byte mirip halaman berita: teks dan link <a>, dengan gambar
+    (sebagian srcset), script, stylesheet dan style url() di tiap blok ke-resource_every."""
+    text = ('<div class="story"><p>' + 'lorem ipsum dolor sit amet ' * 20 + '</p>'
+            '<a href="/article/{i}">read more</a> <a href="/tag/{i}">tag</a></div>\n')
+    resources = ('<div class="card" style="background:url(/img/bg{i}.png)"><img src="/img/{i}.jpg" alt="x">'
+                 '<img srcset="/img/{i}-1x.webp 1x, /img/{i}-2x.webp 2x" src="/img/{i}.png">'
+                 "<script src='/js/{i}.js'></script><link rel=\"stylesheet\" href=\"/css/{i}.css\"></div>\n")
+    parts = ['<html><head><title>bench</title></head><body>']
+    total = 0
+    i = 0
+    while total < size:
+        part = text.format(i=i)
+        if i % resource_every == 0:
+            part += resources.format(i=i % 500)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def bench(html, base_url, repeat):
+    for name, extractor in EXTRACTORS.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            links = extractor(html, base_url)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<25}{best * 1000:>10.2f} ms{len(html) / best / 1e6:>10.1f} MB/s{len(links):>8} links")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark link extractors on a large HTML page.')
+    parser.add_argument('-file', default=None, help='HTML file to use instead of a synthetic page')
+    parser.add_argument('-size', type=float, default=2.0, help='Size of the synthetic page in MB')
+    parser.add_argument('-every', type=int, default=10, help='Put resources in every Nth block of the synthetic page (1 = every block)')
+    parser.add_argument('-repeat', type=int, default=5, help='Runs per extractor (best time is reported)')
+    parser.add_argument('-base', default='http://example.com/', help='Base URL for relative links')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding='utf-8', errors='replace') as file:
+            html = file.read()
+    else:
+        html = synthetic_page(int(args.size * 1e6), args.every)
+    print(f"Page size: {len(html) / 1e6:.2f} MB")
+    bench(html, args.base, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
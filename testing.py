@@ -1,43 +1,21 @@
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.poolmanager import PoolManager
-import socket
+import argparse
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.parse import urljoin, urlparse
-import re
-
-class SourceIPAdapter(HTTPAdapter):
-    def __init__(self, source_address, **kwargs):
-        self.source_address = source_address
-        super(SourceIPAdapter, self).__init__(**kwargs)
-
-    def init_poolmanager(self, *args, **kwargs):
-        kwargs['source_address'] = (self.source_address, 0)
-        return super(SourceIPAdapter, self).init_poolmanager(*args, **kwargs)
-
-def extract_links(html, base_url):
-    pattern = r'<img[^>]+src=["\'](.*?)["\']|<script[^>]+src=["\'](.*?)["\']|<link[^>]+href=["\'](.*?)["\']'
-    matches = re.findall(pattern, html, re.IGNORECASE)
-    links = set()
-    for match in matches:
-        for link in match:
-            if link:
-                absolute_link = urljoin(base_url, link)
-                links.add(absolute_link)
-    return links
+from trafgen_pool import SessionPool
+from trafgen_sources import resolve_sources
+from trafgen_links import extract_links
+from trafgen_fetch import count_body
 
 def fetch_url(session, url):
     try:
-        response = session.get(url, timeout=5)
-        return len(response.content), response.status_code
+        with session.get(url, timeout=5, stream=True) as response:
+            return count_body(response), response.status_code
     except requests.exceptions.RequestException:
         return 0, None
 
 def measure_performance(url, source_ip):
-    session = requests.Session()
-    session.mount('http://', SourceIPAdapter(source_ip))
-    session.mount('https://', SourceIPAdapter(source_ip))
+    session = SessionPool(source_address=source_ip).new_session()
 
     # 🚀 Hitung RTT (hanya request awal)
     start_rtt = time.time()
@@ -45,10 +23,11 @@ def measure_performance(url, source_ip):
         response = session.get(url, timeout=5)
         rtt = (time.time() - start_rtt) * 1000  # ms
         status_code = response.status_code
+        print(f"🌐 Source IP: {source_ip}")
         print(f"⚡ Status Code: {status_code}")
         print(f"🕒 RTT (initial request only): {rtt:.2f} ms")
     except requests.exceptions.RequestException as e:
-        print(f"💥 Error saat RTT: {e}")
+        print(f"💥 Error saat RTT dari {source_ip}: {e}")
         return
 
     # ⚡ Fetch all content (parallel)
@@ -72,6 +51,10 @@ def measure_performance(url, source_ip):
     print(f"⏱️ Latency (full fetch): {latency:.2f} ms")
 
 if __name__ == "__main__":
-    url = 'http://testasp.vulnweb.com/'
-    source_ip = '10.60.0.3'
-    measure_performance(url, source_ip)
+    parser = argparse.ArgumentParser(description='Measure RTT and full page fetch from one or more UE source IPs.')
+    parser.add_argument('-url', default='http://testasp.vulnweb.com/', help='Target URL')
+    parser.add_argument('-src', nargs='+', default=['10.60.0.3'], help='Source IPs or interface names (e.g. uesimtun0)')
+    args = parser.parse_args()
+
+    for source_ip in resolve_sources(args.src):
+        measure_performance(args.url, source_ip)
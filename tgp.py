@@ -1,9 +1,13 @@
 import argparse
+import http.client
 import psutil
-import requests
+import ssl
+import threading
 import time
 import socket
-from ping3 import ping
+from urllib.parse import urlsplit
+from trafgen_hist import is_success
+from trafgen_icmp import IcmpProber
 
 
 def get_ip_from_interface(interface_name):
@@ -16,38 +20,124 @@ def get_ip_from_interface(interface_name):
     raise ValueError(f"Tidak ada alamat IPv4 untuk interface {interface_name}!")
 
 
-def measure_rtt_latency(target_ip, count=4):
-    rtt_list = []
-    for _ in range(count):
-        result = ping(target_ip, unit='ms')
-        if result is not None:
-            rtt_list.append(result)
-        time.sleep(0.5)
-    if not rtt_list:
+def measure_rtt_latency(target_ip, count=4, interval=0.2, source_ip=None, timeout=1.0):
+    """Ping target_ip count kali tiap interval detik lewat IcmpProber (trafgen_icmp), tanpa menunggu balasan
+    satu per satu. Mengembalikan (avg, min, max, loss, jitter); RTT dalam ms, loss berupa rasio."""
+    prober = IcmpProber([target_ip], [source_ip], interval=interval, count=count, timeout=timeout)
+    try:
+        for result in prober.probe():
+            rtt = f"{result.rtt_ms:.2f} ms" if result.rtt_ms is not None else "timeout"
+            print(f"  seq={result.sequence} {rtt}")
+    finally:
+        prober.close()
+    stats = next(iter(prober.stats.values()))
+    if not stats.received:
         raise Exception("Ping gagal. Cek koneksi ke target.")
-    avg_rtt = sum(rtt_list) / len(rtt_list)
-    min_rtt = min(rtt_list)
-    max_rtt = max(rtt_list)
-    return avg_rtt, min_rtt, max_rtt
-
-
-def measure_throughput(url, duration_sec=10):
-    start_time = time.time()
-    bytes_received = 0
-    session = requests.Session()
-
-    while time.time() - start_time < duration_sec:
+    return stats.rtt.mean(), stats.min, stats.max, stats.loss, stats.jitter
+
+
+def _open_connection(parts, source_ip, timeout):
+    source_address = (source_ip, 0) if source_ip else None
+    if parts.scheme == 'https':
+        return http.client.HTTPSConnection(parts.hostname, parts.port, timeout=timeout, source_address=source_address,
+                                           context=ssl.create_default_context())
+    return http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout, source_address=source_address)
+
+
+def _stream(index, url, source_ip, buffer_size, deadline, counters, errors, timeout=5):
+    """Satu stream: GET url berulang (keep-alive) sampai deadline, body dibaca ke buffer yang sama terus.
+
+    Hanya body respons yang lolos is_success (trafgen_hist) dihitung ke
+    throughput; respons lain dihitung error dan body-nya dibuang.
+    """
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    buffer = memoryview(bytearray(buffer_size))
+    connection = None
+    while time.monotonic() < deadline:
         try:
-            response = session.get(url, stream=True, timeout=5)
-            for chunk in response.iter_content(chunk_size=4096):
-                bytes_received += len(chunk)
-        except Exception as e:
-            print(f"Request error: {e}")
-            continue
-
-    elapsed = time.time() - start_time
+            if connection is None:
+                connection = _open_connection(parts, source_ip, timeout)
+            connection.request('GET', path, headers={'Accept-Encoding': 'identity'})
+            response = connection.getresponse()
+            counted = is_success(response.status)
+            if not counted:
+                errors[index] += 1
+                if errors[index] == 1:
+                    print(f"HTTP {response.status} {response.reason} (stream {index}), body not counted")
+            while time.monotonic() < deadline:
+                received = response.readinto(buffer)
+                if not received:
+                    break
+                if counted:
+                    counters[index] += received
+            if response.will_close or not response.isclosed():
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            errors[index] += 1
+            print(f"Request error (stream {index}): {e}")
+            if connection is not None:
+                connection.close()
+                connection = None
+    if connection is not None:
+        connection.close()
+
+
+def _print_sample(name, start, end, received):
+    seconds = end - start
+    mbps = received * 8 / (seconds * 1e6) if seconds > 0 else 0.0
+    print(f"[{name:>3}] {start:6.2f}-{end:6.2f} sec {received / 1e6:10.2f} MB {mbps:10.2f} Mbps")
+
+
+def measure_throughput(url, duration_sec=10, streams=1, interval=1.0, buffer_size=256 * 1024, source_ip=None):
+    """Throughput download ala iperf dengan streams koneksi paralel, masing-masing di thread sendiri.
+
+    Tiap stream memakai satu koneksi keep-alive (diikat ke source_ip kalau
+    diberikan) dan membaca body langsung ke buffer buffer_size byte yang
+    dipakai ulang, tanpa alokasi per chunk. Tiap interval detik dicetak
+    sampel per stream dan totalnya ([SUM]). Mengembalikan (throughput_mbps,
+    bytes_received, elapsed, bytes per stream).
+    """
+    counters = [0] * streams
+    errors = [0] * streams
+    start = time.monotonic()
+    deadline = start + duration_sec
+    threads = [threading.Thread(target=_stream, args=(index, url, source_ip, buffer_size, deadline, counters, errors),
+                                daemon=True)
+               for index in range(streams)]
+    for thread in threads:
+        thread.start()
+
+    # Sampel diambil di batas interval absolut supaya tidak drift
+    previous = [0] * streams
+    sample_start = 0.0
+    while sample_start < duration_sec:
+        sample_end = min(sample_start + interval, duration_sec)
+        time.sleep(max(start + sample_end - time.monotonic(), 0))
+        current = list(counters)
+        if streams > 1:
+            for index in range(streams):
+                _print_sample(index, sample_start, sample_end, current[index] - previous[index])
+        _print_sample('SUM', sample_start, sample_end, sum(current) - sum(previous))
+        previous = current
+        sample_start = sample_end
+
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    print("- - - - - - - - - - - - - - - - - - - - - - - - -")
+    for index in range(streams):
+        _print_sample(index, 0.0, elapsed, counters[index])
+        if errors[index]:
+            print(f"      stream {index}: {errors[index]} request errors")
+    _print_sample('SUM', 0.0, elapsed, sum(counters))
+
+    bytes_received = sum(counters)
     throughput_mbps = (bytes_received * 8) / (elapsed * 1e6)
-    return throughput_mbps, bytes_received, elapsed
+    return throughput_mbps, bytes_received, elapsed, counters
 
 
 def main():
@@ -55,7 +145,11 @@ def main():
     parser.add_argument('-I', '--interface', required=True, help='Nama interface (misal: uesimtun0)')
     parser.add_argument('-U', '--url', required=True, help='Target URL (misal: http://10.0.0.1/file)')
     parser.add_argument('-p', '--ping-count', type=int, default=4, help='Jumlah ping untuk ukur RTT')
+    parser.add_argument('--ping-interval', type=float, default=0.2, help='Seconds between pings')
     parser.add_argument('-t', '--throughput-duration', type=int, default=10, help='Durasi test throughput (detik)')
+    parser.add_argument('-P', '--parallel', type=int, default=1, help='Number of parallel download streams')
+    parser.add_argument('-i', '--interval', type=float, default=1.0, help='Seconds between throughput samples')
+    parser.add_argument('-l', '--buffer', type=int, default=256 * 1024, help='Receive buffer per stream in bytes (reused for every read)')
 
     args = parser.parse_args()
 
@@ -78,16 +172,20 @@ def main():
 
     print("\n=== Mengukur RTT dan Latency ===")
     try:
-        avg_rtt, min_rtt, max_rtt = measure_rtt_latency(target_ip, args.ping_count)
+        avg_rtt, min_rtt, max_rtt, loss, jitter = measure_rtt_latency(target_ip, args.ping_count, args.ping_interval,
+                                                                      local_ip)
         print(f"RTT Rata-rata: {avg_rtt:.2f} ms")
         print(f"RTT Minimum : {min_rtt:.2f} ms")
         print(f"RTT Maksimum: {max_rtt:.2f} ms")
+        print(f"Packet loss : {loss * 100:.1f}%")
+        print(f"Jitter      : {jitter:.2f} ms")
     except Exception as e:
         print(f"[ERROR] {e}")
 
     print("\n=== Mengukur Throughput ===")
     try:
-        tp, bytes_recv, elapsed = measure_throughput(args.url, args.throughput_duration)
+        tp, bytes_recv, elapsed, _ = measure_throughput(args.url, args.throughput_duration, args.parallel,
+                                                        args.interval, args.buffer, local_ip)
         print(f"Total Data Diterima: {bytes_recv / 1e6:.2f} MB")
         print(f"Durasi: {elapsed:.2f} detik")
         print(f"Throughput: {tp:.2f} Mbps")
@@ -0,0 +1,198 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from trafgen_hist import LatencyHistogram, REPORT_PERCENTILES
+
+COLUMNS = ['URL', 'Start Time', 'End Time', 'RTT (ms)', 'Status Code', 'Content Size (bytes)']
+CORRECTED_COLUMN = 'Corrected Latency (ms)'
+
+
+class Bucket:
+    """Jumlah request, error, byte dan histogram RTT untuk satu URL atau satu window waktu."""
+
+    __slots__ = ('count', 'errors', 'bytes', 'latency')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def add(self, frame):
+        self.count += len(frame)
+        self.errors += int(frame['error'].sum())
+        self.bytes += int(frame['Content Size (bytes)'].sum())
+        self.latency.record_many(frame['RTT (ms)'].to_numpy())
+
+    def merge(self, other):
+        self.count += other.count
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.latency.merge(other.latency)
+        return self
+
+
+class LogAnalysis:
+    """Ringkasan satu pass atas satu atau beberapa log request_log_*.log.
+
+    Memorinya tetap: hanya Bucket per URL dan per window (window detik,
+    dihitung dari End Time, jadi RPS per window adalah completed rate) yang
+    disimpan, bukan barisnya. Hasil per file bisa di-merge, jadi file-file
+    bisa dianalisis paralel di proses terpisah.
+    """
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.overall = Bucket()
+        self.corrected = LatencyHistogram()
+        self.per_url = {}
+        self.per_window = {}
+        self.first_start = None
+        self.last_end = None
+
+    def add_chunk(self, chunk):
+        # Baris Total/Average/P50/... di akhir log dan potongan baris rusak
+        # (log lama yang ditulis banyak thread tanpa lock) tidak punya waktu
+        # yang valid, jadi dibuang.
+        chunk = chunk.assign(
+            **{'Start Time': pd.to_datetime(chunk['Start Time'], format='ISO8601', errors='coerce'),
+               'End Time': pd.to_datetime(chunk['End Time'], format='ISO8601', errors='coerce')})
+        chunk = chunk.dropna(subset=['Start Time', 'End Time'])
+        if chunk.empty:
+            return
+        # Sama dengan trafgen_hist.is_success: 2xx dan 304 sukses, sisanya
+        # (status lain, "Failed: ...", "Timeout") error
+        status = pd.to_numeric(chunk['Status Code'].str.strip(), errors='coerce')
+        chunk = chunk.assign(
+            error=~(status.between(200, 299) | (status == 304)),
+            **{'RTT (ms)': pd.to_numeric(chunk['RTT (ms)'], errors='coerce'),
+               'Content Size (bytes)': pd.to_numeric(chunk['Content Size (bytes)'], errors='coerce').fillna(0)})
+
+        start, end = chunk['Start Time'].min(), chunk['End Time'].max()
+        self.first_start = start if self.first_start is None else min(self.first_start, start)
+        self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+        self.overall.add(chunk)
+        if CORRECTED_COLUMN in chunk:
+            self.corrected.record_many(pd.to_numeric(chunk[CORRECTED_COLUMN], errors='coerce').to_numpy())
+        for url, frame in chunk.groupby('URL', sort=False):
+            self.per_url.setdefault(url, Bucket()).add(frame)
+        window_ns = int(self.window * 1e9)
+        windows = chunk['End Time'].to_numpy().astype('datetime64[ns]').astype(np.int64) // window_ns
+        for window, frame in chunk.groupby(windows, sort=False):
+            self.per_window.setdefault(int(window), Bucket()).add(frame)
+
+    def merge(self, other):
+        self.overall.merge(other.overall)
+        self.corrected.merge(other.corrected)
+        for key, bucket in other.per_url.items():
+            if key in self.per_url:
+                self.per_url[key].merge(bucket)
+            else:
+                self.per_url[key] = bucket
+        for key, bucket in other.per_window.items():
+            if key in self.per_window:
+                self.per_window[key].merge(bucket)
+            else:
+                self.per_window[key] = bucket
+        for attr, pick in (('first_start', min), ('last_end', max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+        return self
+
+    def duration(self):
+        if self.first_start is None:
+            return 0.0
+        return (self.last_end - self.first_start).total_seconds()
+
+    def url_rows(self):
+        duration = self.duration()
+        for url, bucket in sorted(self.per_url.items(), key=lambda item: -item[1].count):
+            yield _row(url, bucket, duration)
+
+    def window_rows(self):
+        for window in sorted(self.per_window):
+            start = pd.Timestamp(window * int(self.window * 1e9))
+            yield _row(start, self.per_window[window], self.window)
+
+
+def _row(key, bucket, seconds):
+    row = {'key': key, 'requests': bucket.count,
+           'rps': bucket.count / seconds if seconds > 0 else 0.0,
+           'error_rate': bucket.errors / bucket.count if bucket.count else 0.0,
+           'bytes_per_s': bucket.bytes / seconds if seconds > 0 else 0.0}
+    for p in REPORT_PERCENTILES:
+        row[f"p{p:g}_ms"] = bucket.latency.percentile(p)
+    row['max_ms'] = bucket.latency.max
+    return row
+
+
+def analyze_file(path, window=1.0, chunksize=1_000_000):
+    """Baca satu log per chunk (tanpa memuat seluruh file) dan kembalikan LogAnalysis-nya."""
+    analysis = LogAnalysis(window)
+    header = pd.read_csv(path, sep='\t', nrows=0).columns
+    usecols = COLUMNS + ([CORRECTED_COLUMN] if CORRECTED_COLUMN in header else [])
+    reader = pd.read_csv(path, sep='\t', usecols=usecols, dtype={'URL': str, 'Status Code': str},
+                         chunksize=chunksize, on_bad_lines='skip')
+    for chunk in reader:
+        analysis.add_chunk(chunk)
+    return analysis
+
+
+def analyze_files(paths, window=1.0, chunksize=1_000_000, jobs=None):
+    """Analisis beberapa log, paralel satu proses per file, lalu merge hasilnya."""
+    jobs = jobs or min(len(paths), os.cpu_count() or 1)
+    if jobs <= 1 or len(paths) == 1:
+        parts = [analyze_file(path, window, chunksize) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(analyze_file, paths, [window] * len(paths), [chunksize] * len(paths)))
+
+    analysis = LogAnalysis(window)
+    for part in parts:
+        analysis.merge(part)
+    return analysis
+
+
+def print_table(title, rows, limit=None):
+    percentiles = [f"p{p:g}_ms" for p in REPORT_PERCENTILES] + ['max_ms']
+    print(title)
+    print(f"{'':<50}{'requests':>10}{'rps':>10}{'err %':>8}{'MB/s':>10}" + "".join(f"{name[:-3]:>12}" for name in percentiles))
+    for index, row in enumerate(rows):
+        if limit is not None and index >= limit:
+            break
+        print(f"{str(row['key'])[:49]:<50}{row['requests']:>10}{row['rps']:>10.2f}{row['error_rate'] * 100:>8.2f}"
+              f"{row['bytes_per_s'] / 1e6:>10.3f}" + "".join(f"{row[name]:>12.2f}" for name in percentiles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming analyzer for request_log_*.log files.')
+    parser.add_argument('logs', nargs='+', help='Log files written by trafgen-http.py / trafgen-https.py / tg-http.py / trafgen_rl.py / trafgen_engine.py')
+    parser.add_argument('-window', type=float, default=1.0, help='Time window in seconds for the per-window table')
+    parser.add_argument('-chunksize', type=int, default=1_000_000, help='Rows parsed per chunk')
+    parser.add_argument('-jobs', type=int, default=None, help='Worker processes (default: one per log file, up to the CPU count)')
+    parser.add_argument('-top', type=int, default=20, help='Number of URLs shown (all are written with -csv)')
+    parser.add_argument('-csv', default=None, metavar='PREFIX', help='Also write PREFIX_urls.csv and PREFIX_windows.csv')
+    args = parser.parse_args()
+
+    analysis = analyze_files(args.logs, args.window, args.chunksize, args.jobs)
+    overall = _row('Overall', analysis.overall, analysis.duration())
+    print(f"{analysis.overall.count} requests over {analysis.duration():.2f} s from {len(args.logs)} file(s)")
+    print_table("Overall", [overall])
+    if analysis.corrected.count:
+        print("Corrected latency (ms): " + ", ".join(f"p{p:g}: {analysis.corrected.percentile(p):.2f}"
+                                                     for p in REPORT_PERCENTILES) + f", max: {analysis.corrected.max:.2f}")
+    print_table(f"Per URL (top {args.top})", analysis.url_rows(), args.top)
+    print_table(f"Per {args.window:g} s window", analysis.window_rows())
+
+    if args.csv:
+        pd.DataFrame(analysis.url_rows()).rename(columns={'key': 'url'}).to_csv(f"{args.csv}_urls.csv", index=False)
+        pd.DataFrame(analysis.window_rows()).rename(columns={'key': 'window_start'}).to_csv(f"{args.csv}_windows.csv", index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import glob
+import os
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from trafgen_sched import SCHEDULE_COLUMNS
+from trafgen_timing import PHASE_COLUMNS
+
+_TEXT = pa.dictionary(pa.int32(), pa.string())
+_TIME = pa.timestamp('ns')
+
+# Nama kolom sama dengan header log TSV supaya kode analisis bisa dipakai
+# untuk keduanya. Source IP null kalau skripnya tidak memakai IP sumber.
+SCHEMA = pa.schema(
+    [('URL', _TEXT), ('Start Time', _TIME), ('End Time', _TIME), ('RTT (ms)', pa.float32()),
+     ('Status Code', _TEXT), ('Content Size (bytes)', pa.int64()), ('Throughput (bytes/ms)', pa.float32())]
+    + [(name, pa.float32()) for name in PHASE_COLUMNS]
+    + [(SCHEDULE_COLUMNS[0], _TIME)] + [(name, pa.float32()) for name in SCHEDULE_COLUMNS[1:]]
+    + [('Source IP', _TEXT)]
+)
+DICTIONARY_COLUMNS = [field.name for field in SCHEMA if pa.types.is_dictionary(field.type)]
+
+
+def _floats(values):
+    return [None if value == '' else value for value in values]
+
+
+class ArrowSink:
+    """Sink LogWriter (trafgen_log) yang menulis baris log sebagai file Arrow IPC bertipe.
+
+    Baris dikumpulkan sampai row_group_size lalu ditulis sebagai satu record
+    batch: waktu sebagai timestamp ns (int64), RTT dan kolom ms lain float32,
+    URL/Status Code/Source IP di-dictionary-encode (status disimpan sebagai
+    teks, jadi 200 menjadi '200'). Dictionary tumbuh lewat delta, jadi tiap
+    nilai hanya disimpan sekali per file.
+    """
+
+    def __init__(self, filename, row_group_size=65536):
+        self.filename = filename
+        self.row_group_size = row_group_size
+        self._rows = []
+        self._codes = {name: {} for name in DICTIONARY_COLUMNS}
+        self._file = pa.OSFile(filename, 'wb')
+        self._writer = ipc.new_file(self._file, SCHEMA, options=ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    def _encode(self, name, values):
+        codes = self._codes[name]
+        indices = [None if value is None else codes.setdefault(value, len(codes)) for value in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(list(codes), pa.string()))
+
+    def _write_batch(self):
+        rows, self._rows = self._rows, []
+        width = len(SCHEMA) - 1
+        columns = list(zip(*(row[:width] for row in rows)))
+        columns.append([row[width] if len(row) > width else None for row in rows])
+
+        arrays = []
+        for field, values in zip(SCHEMA, columns):
+            if field.name in DICTIONARY_COLUMNS:
+                arrays.append(self._encode(field.name, [None if value is None else str(value) for value in values]))
+            elif pa.types.is_floating(field.type):
+                arrays.append(pa.array(_floats(values), field.type))
+            else:
+                arrays.append(pa.array(values, field.type))
+        self._writer.write_batch(pa.record_batch(arrays, schema=SCHEMA))
+
+    def write_rows(self, rows):
+        self._rows.extend(rows)
+        if len(self._rows) >= self.row_group_size:
+            self._write_batch()
+
+    def close(self):
+        if self._rows:
+            self._write_batch()
+        self._writer.close()
+        self._file.close()
+
+
+def result_files(log_file):
+    """File Arrow milik log_file: {log_file}.arrow dan part per worker {log_file}.w<i>.arrow."""
+    return sorted(glob.glob(glob.escape(log_file) + '.arrow') + glob.glob(glob.escape(log_file) + '.w*.arrow'))
+
+
+def clear_results(log_file):
+    for path in result_files(log_file):
+        os.remove(path)
+
+
+def load_results(paths):
+    """Memory-map satu atau beberapa file ArrowSink menjadi satu pyarrow.Table tanpa menyalin data.
+
+    paths boleh satu path, list path, atau nama log TSV (semua result_files
+    miliknya dibuka). Pakai .to_pandas() kalau butuh DataFrame.
+    """
+    if isinstance(paths, str):
+        paths = [paths] if paths.endswith('.arrow') else result_files(paths)
+    tables = [ipc.open_file(pa.memory_map(path, 'r')).read_all() for path in paths]
+    if not tables:
+        return SCHEMA.empty_table()
+    return pa.concat_tables(tables)
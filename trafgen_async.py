@@ -0,0 +1,249 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from trafgen_fetch import CHUNK_SIZE, MAX_PER_HOST, is_html
+from trafgen_hist import RunStats, is_success
+from trafgen_pool import CONNECTION_MODES
+from trafgen_sched import schedule_columns
+from trafgen_timing import EMPTY_PHASES, PhaseTimer
+
+# Engine asyncio untuk generate_traffic: satu event loop, jumlah request
+# in-flight dibatasi oleh semaphore (bisa puluhan ribu), bukan 100 thread.
+
+CLIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def phase_trace_config():
+    """TraceConfig yang mengisi PhaseTimer yang dikirim lewat trace_request_ctx.
+
+    Di aiohttp rentang connection_create juga mencakup resolve DNS, jadi DNS
+    yang terjadi di dalamnya dikurangkan dari Connect (sama seperti
+    TimedHTTPConnection di engine thread). aiohttp tidak punya event terpisah
+    untuk TLS, jadi untuk https kolom Connect sudah termasuk handshake TLS
+    dan kolom TLS dibiarkan kosong.
+    """
+    async def dns_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def dns_end(session, ctx, params):
+        if ctx.trace_request_ctx is not None:
+            ctx.trace_request_ctx.dns += (time.perf_counter() - ctx.dns_start) * 1000
+
+    async def connect_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+        if ctx.trace_request_ctx is not None:
+            ctx.dns_before = ctx.trace_request_ctx.dns
+
+    async def connect_end(session, ctx, params):
+        timer = ctx.trace_request_ctx
+        if timer is not None:
+            elapsed = (time.perf_counter() - ctx.connect_start) * 1000
+            timer.connect += max(elapsed - (timer.dns - ctx.dns_before), 0.0)
+
+    config = aiohttp.TraceConfig()
+    config.on_dns_resolvehost_start.append(dns_start)
+    config.on_dns_resolvehost_end.append(dns_end)
+    config.on_connection_create_start.append(connect_start)
+    config.on_connection_create_end.append(connect_end)
+    return config
+
+
+async def count_body_async(response, chunk_size=CHUNK_SIZE):
+    """Padanan count_body (trafgen_fetch): body dihitung per chunk lalu dibuang, tidak di-buffer."""
+    size = 0
+    async for chunk in response.content.iter_chunked(chunk_size):
+        size += len(chunk)
+    return size
+
+
+async def _fetch_asset(session, link, host_limit, chunk_size=CHUNK_SIZE):
+    async with host_limit:
+        try:
+            async with session.get(link) as content_response:
+                return await count_body_async(content_response, chunk_size)
+        except CLIENT_ERRORS:
+            return 0
+
+
+async def fetch_content_size_async(session, url, extract_links, per_host=MAX_PER_HOST, manifest=None,
+                                   chunk_size=CHUNK_SIZE):
+    """Kembalikan (status, content_size, phases) seperti AssetFetcher.fetch_page.
+
+    Sub-resource diambil paralel, maksimal per_host sekaligus per host.
+    manifest (ManifestCache) dan chunk_size dipakai sama seperti di
+    AssetFetcher: hanya dokumen HTML yang link-nya perlu dicari yang di-buffer.
+    Kegagalan dokumen utama (CLIENT_ERRORS) diteruskan ke pemanggil.
+    """
+    timer = PhaseTimer()
+    request_start = time.perf_counter()
+    async with session.get(url, trace_request_ctx=timer) as response:
+        headers_received = time.perf_counter()
+        status = response.status
+        html = is_html(response.headers) and is_success(status)
+        links = None
+        if html and manifest is not None:
+            links = manifest.etag_links(url, response.headers)
+        if html and links is None:
+            body = await response.read()
+            content_size = len(body)
+        else:
+            content_size = await count_body_async(response, chunk_size)
+        transfer = (time.perf_counter() - headers_received) * 1000
+    ttfb = (headers_received - request_start) * 1000
+    phases = [ttfb, timer.dns, timer.connect, '', transfer]
+
+    def decode():
+        return body.decode(response.get_encoding(), errors='replace')
+
+    if links is None and html:
+        if manifest is not None:
+            links = manifest.links(url, response.headers, body, decode, extract_links)
+        else:
+            links = extract_links(decode(), url)
+
+    host_limits = {}
+    assets = []
+    for link in links or []:
+        host = urlsplit(link).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(per_host)
+        assets.append(_fetch_asset(session, link, host_limits[host], chunk_size))
+    content_size += sum(await asyncio.gather(*assets))
+    return status, content_size, phases
+
+
+async def make_request_async(pool, url, intended, stats, extract_links, write_log, per_host=MAX_PER_HOST,
+                             source_ip=None, manifest=None, chunk_size=CHUNK_SIZE, verbose=True):
+    start_time = datetime.now()
+    try:
+        async with pool.page() as session:
+            status, content_size, phases = await fetch_content_size_async(session, url, extract_links, per_host, manifest,
+                                                                    chunk_size)
+        end_time = datetime.now()
+        rtt = (end_time - start_time).total_seconds() * 1000
+
+        if rtt < 1:
+            rtt = 1
+
+        throughput = content_size / rtt
+
+        log_data = [url, start_time, end_time, rtt, status, content_size, throughput] + phases + schedule_columns(intended, start_time, rtt)
+        if verbose:
+            print(f"Request to {url} completed with status code: {status}, RTT: {rtt:.6f} ms, Content size: {content_size} bytes, Throughput: {throughput:.2f} bytes/ms")
+    except CLIENT_ERRORS as e:
+        end_time = datetime.now()
+        rtt = (end_time - start_time).total_seconds() * 1000
+        if rtt < 1:
+            rtt = 1
+        log_data = [url, start_time, end_time, rtt, f"Failed: {e}", 0, 0] + EMPTY_PHASES + schedule_columns(intended, start_time, rtt)
+        if verbose:
+            print(f"Request to {url} failed: {e}, RTT: {rtt:.6f} ms")
+
+    if source_ip is not None:
+        log_data.append(source_ip)
+    stats.record(log_data)
+    write_log(log_data)
+
+
+class AsyncSessionPool:
+    """Padanan SessionPool (trafgen_pool) untuk aiohttp.
+
+    'persistent' memakai satu ClientSession bersama, 'fresh' membuat
+    ClientSession dan connector baru untuk tiap halaman.
+    """
+
+    def __init__(self, mode='persistent', limit=100, ssl=True, local_addr=None):
+        if mode not in CONNECTION_MODES:
+            raise ValueError(f"Mode koneksi tidak dikenal: {mode}")
+        self.limit = limit
+        self.ssl = ssl
+        self.local_addr = local_addr
+        self._shared = self.new_session() if mode == 'persistent' else None
+
+    def new_session(self):
+        connector = aiohttp.TCPConnector(limit=self.limit, ssl=self.ssl, local_addr=self.local_addr)
+        return aiohttp.ClientSession(connector=connector, trace_configs=[phase_trace_config()])
+
+    @asynccontextmanager
+    async def page(self):
+        if self._shared is not None:
+            yield self._shared
+            return
+        async with self.new_session() as session:
+            yield session
+
+    async def close(self):
+        if self._shared is not None:
+            await self._shared.close()
+
+
+async def _generate_traffic(sampler, num_requests, scheduler,
+                            extract_links, write_log, max_in_flight, per_host, conn_mode, ssl, sources, manifest,
+                            chunk_size, verbose):
+    stats = RunStats()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks = set()
+
+    def done(task):
+        tasks.discard(task)
+        in_flight.release()
+
+    # Satu pool per IP sumber; tanpa sources cukup satu pool dengan alamat
+    # sumber default.
+    source_ips = sources.sources if sources is not None else [None]
+    pools = {}
+    for source_ip in source_ips:
+        local_addr = (source_ip, 0) if source_ip is not None else None
+        pools[source_ip] = AsyncSessionPool(conn_mode, max_in_flight, ssl, local_addr)
+
+    try:
+        scheduler.start()
+        for offset in scheduler.offsets(num_requests):
+            await scheduler.wait_async(offset)
+            url = next(sampler)
+            source_ip = sources.pick() if sources is not None else None
+            await in_flight.acquire()
+            intended = scheduler.intended(offset)
+            task = asyncio.create_task(make_request_async(pools[source_ip], url, intended, stats,
+                                                          extract_links, write_log, per_host, source_ip, manifest,
+                                                          chunk_size, verbose))
+            tasks.add(task)
+            task.add_done_callback(done)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        for pool in pools.values():
+            await pool.close()
+    scheduler.report(stats.count)
+    return stats
+
+
+def generate_traffic_async(sampler, num_requests, scheduler,
+                           extract_links, write_log, max_in_flight=10000, per_host=MAX_PER_HOST,
+                           conn_mode='persistent', ssl=True, sources=None, manifest=None,
+                           chunk_size=CHUNK_SIZE, verbose=True):
+    """Versi asyncio dari generate_traffic dengan skema log yang sama; mengembalikan RunStats.
+
+    sampler adalah iterator URL (ZipfSampler dari trafgen_zipf), scheduler
+    adalah ArrivalScheduler (trafgen_sched) yang menentukan kapan tiap
+    request dikirim. write_log dipanggil dengan tiap baris log (biasanya
+    LogWriter.write dari trafgen_log). max_in_flight membatasi jumlah
+    halaman yang sedang diproses sekaligus (dan ukuran pool koneksi),
+    per_host membatasi sub-resource paralel per host untuk tiap halaman.
+    conn_mode sama seperti -conn di skrip thread (persistent atau fresh).
+    ssl=False mematikan verifikasi sertifikat. sources (SourcePool dari
+    trafgen_sources) menyebar request ke beberapa IP sumber; IP yang dipakai
+    ditambahkan sebagai kolom terakhir di log. manifest (ManifestCache dari
+    trafgen_manifest) menyimpan daftar sub-resource per halaman. Body yang
+    tidak perlu di-parse dibaca per chunk_size byte dan langsung dibuang.
+    verbose=False menghilangkan print per request.
+    """
+    return asyncio.run(_generate_traffic(sampler, num_requests, scheduler,
+                                         extract_links, write_log, max_in_flight, per_host, conn_mode, ssl,
+                                         sources, manifest, chunk_size, verbose))
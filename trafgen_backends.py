@@ -0,0 +1,260 @@
+import socket
+import ssl
+import warnings
+from urllib.parse import urlsplit
+
+import requests
+
+from trafgen_async import generate_traffic_async
+from trafgen_fetch import AssetFetcher, MAX_PER_HOST
+from trafgen_icmp import ping_once
+from trafgen_links import extract_links
+from trafgen_manifest import ManifestCache
+from trafgen_pool import SessionPool, CONNECTION_MODES
+from trafgen_sources import SourcePool, SOURCE_POLICIES, resolve_sources
+from trafgen_timing import EMPTY_PHASES
+
+
+class Backend:
+    """Protokol yang dipakai engine (trafgen_engine) untuk satu request.
+
+    Engine thread memanggil pick() di thread penjadwal (urutan pilihan
+    sumber tetap deterministik), lalu fetch(url, source) di worker yang
+    mengembalikan (status, content_size, phases) atau raise salah satu
+    errors; status yang tidak lolos is_success (trafgen_hist) dihitung error.
+    rtt(elapsed_ms, phases) memberi kolom RTT dari rentang yang diukur engine.
+    columns(source) adalah nilai extra_columns di akhir baris log. Engine
+    async memanggil run_async. Satu objek backend dibuat per worker proses
+    dengan seed shard-nya.
+    """
+
+    name = None
+    url_file = 'url_bineca_http.csv'
+    log_file = 'request_log_http.log'
+    extra_columns = []
+    engines = ('thread', 'async')
+    errors = ()
+
+    @classmethod
+    def add_arguments(cls, parser):
+        pass
+
+    @classmethod
+    def prepare(cls, args):
+        """Normalisasi argumen sekali di proses utama, sebelum worker di-fork."""
+
+    def __init__(self, args, seed=None):
+        self.args = args
+        self.seed = seed
+
+    def start(self):
+        """Siapkan resource engine thread (session, executor sub-resource)."""
+
+    def pick(self):
+        return None
+
+    def fetch(self, url, source=None):
+        raise NotImplementedError
+
+    def rtt(self, elapsed_ms, phases):
+        # Minimal 1 ms supaya throughput tidak dibagi nol
+        return max(elapsed_ms, 1)
+
+    def columns(self, source):
+        return []
+
+    def run_async(self, sampler, num_requests, scheduler, write_log, verbose=True):
+        raise NotImplementedError(f"Backend {self.name} tidak punya engine async")
+
+    def close(self):
+        pass
+
+
+def add_source_arguments(parser, default):
+    parser.add_argument('-src', nargs='+', default=default, help='Source IPs or interface names (e.g. uesimtun0), one per UE')
+    parser.add_argument('-src-policy', choices=SOURCE_POLICIES, default='rr', help='How requests are spread over sources: rr, weighted or zipf (uses -zipf q s over the source list)')
+    parser.add_argument('-src-weights', type=float, nargs='+', default=None, help='Per-source weights for -src-policy weighted')
+
+
+class HttpBackend(Backend):
+    """Halaman HTTP beserta sub-resource-nya lewat requests (thread) atau aiohttp (async)."""
+
+    name = 'http'
+    errors = (requests.exceptions.RequestException,)
+    verify = True
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument('-perhost', type=int, default=MAX_PER_HOST, help='Max parallel sub-resource fetches per host for each page')
+        parser.add_argument('-manifest', type=int, default=1024, help='Pages whose sub-resource list is cached (LRU, keyed by URL + ETag/content hash; 0 disables)')
+        parser.add_argument('-manifest-ttl', type=float, default=300.0, help='Seconds a cached sub-resource list stays valid')
+        parser.add_argument('-chunk', type=int, default=65536, help='Read size in bytes for bodies that are counted without buffering')
+        parser.add_argument('-conn', choices=CONNECTION_MODES, default='persistent', help='persistent: keep-alive pool shared by all pages, fresh: new connections for every page (cold users)')
+        parser.add_argument('-poolsize', type=int, default=100, help='Idle connections kept per host in the persistent pool')
+
+    def __init__(self, args, seed=None):
+        super().__init__(args, seed)
+        self.manifest = ManifestCache(args.manifest, args.manifest_ttl)
+        self.fetcher = None
+        self.pool = None
+
+    def ssl_option(self):
+        """Nilai ssl untuk aiohttp yang setara dengan verify di requests."""
+        if isinstance(self.verify, str):
+            return ssl.create_default_context(cafile=self.verify)
+        return self.verify
+
+    def async_sources(self):
+        return None
+
+    def start(self):
+        args = self.args
+        self.fetcher = AssetFetcher(per_host=args.perhost, manifest=self.manifest, chunk_size=args.chunk,
+                                    verify=self.verify)
+        self.pool = SessionPool(args.conn, pool_maxsize=args.poolsize, verify=self.verify)
+
+    def session_pool(self, source):
+        return self.pool
+
+    def fetch(self, url, source=None):
+        with self.session_pool(source).page() as session:
+            return self.fetcher.fetch_page(session, url, extract_links)
+
+    def run_async(self, sampler, num_requests, scheduler, write_log, verbose=True):
+        args = self.args
+        return generate_traffic_async(sampler, num_requests, scheduler, extract_links, write_log,
+                                      max_in_flight=args.inflight, per_host=args.perhost, conn_mode=args.conn,
+                                      ssl=self.ssl_option(), sources=self.async_sources(), manifest=self.manifest,
+                                      chunk_size=args.chunk, verbose=verbose)
+
+    def close(self):
+        if self.fetcher is not None:
+            self.fetcher.shutdown()
+        if self.pool is not None:
+            self.pool.close()
+        self.manifest.report()
+
+
+class HttpsBackend(HttpBackend):
+    """HTTPS tanpa verifikasi sertifikat (seperti sebelumnya), atau diverifikasi dengan CA sendiri lewat -ca."""
+
+    name = 'https'
+    url_file = 'url_bineca_https.csv'
+    log_file = 'request_log_https.log'
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument('-ca', default=None, help='CA bundle (PEM) to verify the server certificate; without it certificates are not verified')
+
+    def __init__(self, args, seed=None):
+        super().__init__(args, seed)
+        self.verify = args.ca or False
+        if self.verify is False:
+            # Suppress only the specific InsecureRequestWarning from urllib3
+            warnings.simplefilter('ignore', requests.packages.urllib3.exceptions.InsecureRequestWarning)
+
+
+class SourceBackend(HttpBackend):
+    """HTTP dari beberapa IP sumber (satu per UE), dengan SourcePool dari trafgen_sources."""
+
+    name = 'source'
+    extra_columns = ['Source IP']
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        add_source_arguments(parser, ['10.60.0.1'])
+
+    @classmethod
+    def prepare(cls, args):
+        args.src = resolve_sources(args.src)
+
+    def __init__(self, args, seed=None):
+        super().__init__(args, seed)
+        self.sources = SourcePool(args.src, args.src_policy, args.src_weights, tuple(args.zipf or (1.0, 1.0)),
+                                  seed=seed, conn_mode=args.conn, pool_maxsize=args.poolsize)
+
+    def async_sources(self):
+        return self.sources
+
+    def start(self):
+        args = self.args
+        self.fetcher = AssetFetcher(per_host=args.perhost, manifest=self.manifest, chunk_size=args.chunk)
+
+    def pick(self):
+        return self.sources.pick()
+
+    def session_pool(self, source):
+        return self.sources.pool(source)
+
+    def columns(self, source):
+        return [source]
+
+    def close(self):
+        self.sources.close()
+        super().close()
+
+
+class IcmpBackend(Backend):
+    """Satu echo request ICMP ke host tiap URL (ping_once dari trafgen_icmp) per request.
+
+    URL boleh berupa URL lengkap atau nama host/IP saja. Hanya engine
+    thread; tiap request membuka socket ICMP sendiri dari IP sumber yang
+    dipilih. Content size adalah ukuran payload echo. RTT echo dari
+    ping_once (tanpa waktu membuka socket) menjadi kolom RTT dan TTFB,
+    menggantikan rentang yang diukur engine; echo yang tidak dibalas dicatat
+    dengan status Timeout, jadi loss terhitung error.
+    """
+
+    name = 'icmp'
+    log_file = 'request_log_icmp.log'
+    extra_columns = ['Source IP']
+    engines = ('thread',)
+    errors = (OSError,)
+
+    @classmethod
+    def add_arguments(cls, parser):
+        add_source_arguments(parser, ['0.0.0.0'])
+        parser.add_argument('-icmp-timeout', type=float, default=1.0, help='Seconds to wait for each echo reply')
+        parser.add_argument('-icmp-size', type=int, default=56, help='Echo payload size in bytes')
+
+    @classmethod
+    def prepare(cls, args):
+        args.src = resolve_sources(args.src)
+
+    def __init__(self, args, seed=None):
+        super().__init__(args, seed)
+        self.sources = SourcePool(args.src, args.src_policy, args.src_weights, tuple(args.zipf or (1.0, 1.0)),
+                                  seed=seed)
+        self.payload = bytes(args.icmp_size)
+        self._addresses = {}
+
+    def pick(self):
+        return self.sources.pick()
+
+    def address(self, url):
+        """IP host url, di-cache supaya DNS tidak ikut terukur di tiap ping."""
+        address = self._addresses.get(url)
+        if address is None:
+            host = urlsplit(url).hostname if '://' in url else url
+            address = self._addresses[url] = socket.gethostbyname(host)
+        return address
+
+    def fetch(self, url, source=None):
+        try:
+            rtt_ms = ping_once(self.address(url), source, self.args.icmp_timeout, self.payload)
+        except TimeoutError:
+            # Echo hilang adalah hasil ukur (loss), bukan kegagalan kirim
+            return 'Timeout', 0, EMPTY_PHASES
+        return 200, len(self.payload), [rtt_ms] + EMPTY_PHASES[1:]
+
+    def rtt(self, elapsed_ms, phases):
+        # Echo yang dibalas: RTT dari ping_once, tanpa dibulatkan ke 1 ms
+        return phases[0] if phases[0] != '' else super().rtt(elapsed_ms, phases)
+
+    def columns(self, source):
+        return [source]
+
+
+BACKENDS = {backend.name: backend for backend in (HttpBackend, HttpsBackend, SourceBackend, IcmpBackend)}
@@ -0,0 +1,292 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import pandas as pd
+
+from trafgen_backends import BACKENDS
+from trafgen_forecast import ForecastService, DEFAULT_CACHE_DIR
+from trafgen_hist import RunStats
+from trafgen_log import LogWriter
+from trafgen_metrics import Metrics, MeteredLog, MetricsServer
+from trafgen_profile import RateProfile, ProfileScheduler, PROFILE_MODES
+from trafgen_sched import ArrivalScheduler, ARRIVAL_MODES, SCHEDULE_COLUMNS, schedule_columns
+from trafgen_timing import EMPTY_PHASES, PHASE_COLUMNS, print_phase_summary
+from trafgen_trace import TraceScheduler
+from trafgen_workers import run_workers
+from trafgen_zipf import ZipfSampler
+
+# Ukuran ThreadPoolExecutor engine thread (juga concurrency untuk gauge antrian -metrics-port)
+THREAD_WORKERS = 100
+# Model dan data untuk -rps rf
+RF_MODEL_FILE = 'rf_model.pkl'
+RF_DATA_FILE = 'data_forecast.csv'
+RF_FEATURE_COLUMNS = ['x1', 'x2', 'x3']
+LOG_COLUMNS = (['URL', 'Start Time', 'End Time', 'RTT (ms)', 'Status Code', 'Content Size (bytes)',
+                'Throughput (bytes/ms)'] + PHASE_COLUMNS + SCHEDULE_COLUMNS)
+
+def make_request(url, intended, stats, backend, source, log, verbose=True):
+    start_time = datetime.now()
+    try:
+        status, content_size, phases = backend.fetch(url, source)
+        end_time = datetime.now()
+        rtt = backend.rtt((end_time - start_time).total_seconds() * 1000, phases)
+        throughput = content_size / rtt if rtt else 0
+
+        log_data = [url, start_time, end_time, rtt, status, content_size, throughput] + phases + schedule_columns(intended, start_time, rtt) + backend.columns(source)
+        stats.record(log_data)
+        if verbose:
+            print(f"Request to {url} completed with status code: {status}, RTT: {rtt:.6f} ms, Content size: {content_size} bytes, Throughput: {throughput:.2f} bytes/ms")
+    except backend.errors as e:
+        end_time = datetime.now()
+        rtt = backend.rtt((end_time - start_time).total_seconds() * 1000, EMPTY_PHASES)
+        log_data = [url, start_time, end_time, rtt, f"Failed: {e}", 0, 0] + EMPTY_PHASES + schedule_columns(intended, start_time, rtt) + backend.columns(source)
+        stats.record(log_data)
+        if verbose:
+            print(f"Request to {url} failed: {e}, RTT: {rtt:.6f} ms")
+
+    log.write(log_data)
+
+def generate_traffic(sampler, num_requests, scheduler, backend, log, verbose=True):
+    stats = RunStats()
+    executor = ThreadPoolExecutor(max_workers=THREAD_WORKERS)
+
+    scheduler.start()
+    for offset in scheduler.offsets(num_requests):
+        scheduler.wait(offset)
+        url = next(sampler)
+        source = backend.pick()
+        executor.submit(make_request, url, scheduler.intended(offset), stats, backend, source, log, verbose)
+
+    executor.shutdown(wait=True)
+    scheduler.report(stats.count)
+    return stats
+
+def calculate_totals_and_averages(stats):
+    if not stats.count:
+        print("No results to calculate totals and averages.")
+        return ["Total", "", "", 0, "", "", 0], ["Average", "", "", 0, "", "", 0]
+
+    average_rtt = stats.total_rtt / stats.count
+    average_throughput = stats.total_throughput / stats.count
+
+    total_data = ["Total", "", "", stats.total_rtt, "", "", stats.total_throughput]
+    average_data = ["Average", "", "", average_rtt, "", "", average_throughput]
+
+    return total_data, average_data
+
+def load_model_and_forecast(pickle_file, forecast_data_file, feature_columns, time_column='timestamp',
+                            cache_dir=DEFAULT_CACHE_DIR):
+    """Forecast rate untuk seluruh baris forecast_data_file, dikembalikan sebagai (timestamps, forecast).
+
+    Prediksi di-cache di cache_dir (lihat ForecastService di trafgen_forecast).
+    Selama run, forecast_refresher memperbarui profil dari file yang sama.
+    """
+    service = ForecastService(pickle_file, forecast_data_file, feature_columns, time_column, cache_dir)
+    timestamps, forecast = service.forecast()
+    service.report()
+    return timestamps, forecast
+
+def forecast_refresher(args, share):
+    """refresh untuk ProfileScheduler: profil -rps rf baru kalau data forecast berubah, selain itu None.
+
+    Tiap worker punya ForecastService sendiri; selama file data tidak berubah
+    refresh hanya os.stat, dan baris yang ditambahkan diprediksi incremental.
+    """
+    service = ForecastService(RF_MODEL_FILE, RF_DATA_FILE, RF_FEATURE_COLUMNS, cache_dir=args.forecast_cache or None)
+    service.forecast()
+
+    def refresh():
+        try:
+            timestamps, forecast = service.forecast()
+            if service.last_status == 'memory':
+                return None
+            profile = RateProfile.from_series(timestamps, forecast, args.speedup, args.rate_scale).scaled(share)
+        except (OSError, ValueError, KeyError, ImportError) as e:
+            # File data yang sedang ditulis atau model yang tidak bisa dimuat: profil lama tetap dipakai sampai refresh berikutnya
+            print(f"Forecast refresh failed, keeping the current rate profile: {e}")
+            return None
+        service.report()
+        return profile
+
+    return refresh
+
+def load_rate(args):
+    """Sumber rate dari -rps: angka (rate konstan), RateProfile dari forecast RF atau CSV timestamp,rate.
+
+    Dengan -trace tanpa -rps jadwal diambil dari trace, jadi rate-nya 0.
+    """
+    if args.rps is None:
+        return 0.0
+    if args.rps.lower() == 'rf':
+        timestamps, forecast = load_model_and_forecast(RF_MODEL_FILE, RF_DATA_FILE, RF_FEATURE_COLUMNS,
+                                                       cache_dir=args.forecast_cache or None)
+        return RateProfile.from_series(timestamps, forecast, args.speedup, args.rate_scale)
+    if os.path.isfile(args.rps):
+        return RateProfile.from_csv(args.rps, args.profile_columns[0], args.profile_columns[1],
+                                    args.speedup, args.rate_scale)
+    return float(args.rps) * args.rate_scale
+
+def make_scheduler(args, rate, shard):
+    """Penjadwal untuk satu shard: TraceScheduler, ProfileScheduler atau ArrivalScheduler."""
+    if args.trace:
+        return TraceScheduler(args.trace, args.speed, shard.get('index', 0), args.workers,
+                              reorder_window=args.trace_window)
+    if isinstance(rate, RateProfile):
+        # split_budget membagi rate rata-rata ke tiap worker, jadi profil
+        # diskalakan dengan perbandingan yang sama
+        share = shard['requests_per_second'] / rate.mean_rate
+        refresh = None
+        if args.forecast_refresh and args.rps is not None and args.rps.lower() == 'rf':
+            refresh = forecast_refresher(args, share)
+        return ProfileScheduler(rate.scaled(share), args.arrival, seed=shard['seed'], refresh=refresh,
+                                refresh_interval=args.forecast_refresh)
+    return ArrivalScheduler(shard['requests_per_second'], args.arrival, tuple(args.burst), seed=shard['seed'])
+
+def run_engine(args, backend, sampler, scheduler, num_requests, log):
+    if args.engine == 'async':
+        try:
+            return backend.run_async(sampler, num_requests, scheduler, log.write, verbose=not args.quiet)
+        finally:
+            backend.close()
+
+    backend.start()
+    try:
+        return generate_traffic(sampler, num_requests, scheduler, backend, log, verbose=not args.quiet)
+    finally:
+        backend.close()
+
+def run_shard(backend_class, args, urls, rate, shard):
+    scheduler = make_scheduler(args, rate, shard)
+    # TraceScheduler memberi jadwal sekaligus URL-nya
+    sampler = scheduler if args.trace else ZipfSampler(urls, *args.zipf, seed=shard['seed'])
+    backend = backend_class(args, seed=shard['seed'])
+    sinks = []
+    if args.arrow:
+        # pyarrow opsional, hanya diimpor kalau -arrow dipakai
+        from trafgen_arrow import ArrowSink
+        sinks.append(ArrowSink(f"{shard['log_file']}.arrow"))
+    metrics = None
+    if args.metrics_port is not None:
+        # Tiap worker membuka port sendiri: -metrics-port + index worker
+        concurrency = args.inflight if args.engine == 'async' else THREAD_WORKERS
+        metrics = MetricsServer(Metrics(scheduler, concurrency), args.metrics_port + shard.get('index', 0),
+                                args.metrics_host)
+    log = LogWriter(shard['log_file'], max_queue=args.logqueue, drop=args.logdrop, sinks=sinks)
+    if metrics is not None:
+        log = MeteredLog(log, metrics.metrics)
+    try:
+        return run_engine(args, backend, sampler, scheduler, shard['num_requests'], log)
+    finally:
+        log.close()
+        if metrics is not None:
+            metrics.close()
+
+def build_parser(backend_class, description='Generate traffic for URLs with Zipf distribution.'):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-url', type=int, default=None, help='Number of URLs')
+    parser.add_argument('-req', type=int, default=None, help='Number of requests (with -trace: stop after this many, default the whole trace; with a rate profile the run also stops at the end of the profile)')
+    parser.add_argument('-rps', default=None, help='Requests per second, "rf" to replay the Random Forest forecast series, or a CSV file of timestamp,rate to replay')
+    parser.add_argument('-zipf', type=float, nargs=2, default=None, help='Zipf parameters: q and s')
+    parser.add_argument('-engine', choices=backend_class.engines, default='thread', help='Traffic engine: thread (ThreadPoolExecutor) or async (asyncio)')
+    parser.add_argument('-inflight', type=int, default=10000, help='Max in-flight requests for the async engine')
+    backend_class.add_arguments(parser)
+    parser.add_argument('-logqueue', type=int, default=100000, help='Max log rows buffered for the log writer thread')
+    parser.add_argument('-logdrop', action='store_true', help='Drop log rows instead of blocking when the log writer queue is full')
+    parser.add_argument('-arrow', action='store_true', help='Also write typed columnar results to <log>.arrow (Arrow IPC, needs pyarrow)')
+    parser.add_argument('-seed', type=int, default=None, help='Random seed for a reproducible URL/arrival stream')
+    parser.add_argument('-quiet', action='store_true', help='Do not print a line per request (summaries are still printed)')
+    parser.add_argument('-metrics-port', type=int, default=None, help='Serve live Prometheus metrics on this port (worker i uses port + i)')
+    parser.add_argument('-metrics-host', default='127.0.0.1', help='Listen address for -metrics-port')
+    parser.add_argument('-workers', '--workers', type=int, default=1, help='Number of worker processes sharing the -req/-rps budget')
+    parser.add_argument('-arrival', choices=ARRIVAL_MODES, default='constant', help='Arrival process: constant, poisson or onoff (a rate profile supports constant and poisson)')
+    parser.add_argument('-burst', type=float, nargs=2, default=[1.0, 1.0], metavar=('ON', 'OFF'), help='On/off durations in seconds for -arrival onoff')
+    parser.add_argument('-forecast-cache', default=DEFAULT_CACHE_DIR, help='Directory for cached -rps rf predictions (empty string disables)')
+    parser.add_argument('-forecast-refresh', type=float, default=60.0, help='Seconds between checks of the -rps rf data file during a run; appended rows are predicted incrementally and extend the rate profile (0 disables)')
+    parser.add_argument('-speedup', type=float, default=1.0, help='Time compression for a rate profile (60 replays 24 hours in 24 minutes)')
+    parser.add_argument('-rate-scale', type=float, default=1.0, help='Multiply every rate (constant or profile) by this factor')
+    parser.add_argument('-profile-columns', nargs=2, default=['timestamp', 'rate'], metavar=('TIME', 'RATE'), help='Column names in a -rps CSV profile')
+    parser.add_argument('-trace', default=None, help='Replay the URLs and inter-arrival gaps of a request log (or a CSV/TSV with URL and time columns) instead of Zipf sampling')
+    parser.add_argument('-speed', type=float, default=1.0, help='Time scaling for -trace (2 replays twice as fast)')
+    parser.add_argument('-trace-window', type=float, default=60.0, help='Seconds of -trace rows buffered to restore start-time order (must exceed the longest RTT in the trace)')
+    return parser
+
+def main(backend_class=None):
+    """CLI bersama untuk semua skrip trafgen; backend_class dari trafgen_backends (atau -backend kalau None)."""
+    if backend_class is None:
+        selector = argparse.ArgumentParser(add_help=False)
+        selector.add_argument('-backend', choices=list(BACKENDS), default='http')
+        known, remaining = selector.parse_known_args()
+        backend_class = BACKENDS[known.backend]
+        sys.argv[1:] = remaining
+
+    print("############ Tunggu Sebentar ############")
+
+    parser = build_parser(backend_class)
+    args = parser.parse_args()
+    log_file = backend_class.log_file
+    if args.trace is None:
+        missing = [flag for flag, value in (('-url', args.url), ('-req', args.req), ('-rps', args.rps), ('-zipf', args.zipf))
+                   if value is None]
+        if missing:
+            parser.error(f"the following arguments are required without -trace: {', '.join(missing)}")
+    elif not os.path.exists(args.trace):
+        parser.error(f"-trace file not found: {args.trace}")
+    elif os.path.exists(log_file) and os.path.samefile(args.trace, log_file):
+        parser.error(f"-trace cannot read {log_file} because this run overwrites it; copy it first")
+    if args.forecast_refresh < 0:
+        parser.error(f"-forecast-refresh must be >= 0, not {args.forecast_refresh:g}")
+    backend_class.prepare(args)
+
+    number_of_requests = args.req if args.req is not None else sys.maxsize
+    try:
+        rate = load_rate(args)
+    except ValueError as e:
+        print(f"Invalid value for requests per second: {args.rps} ({e})")
+        return
+    if isinstance(rate, RateProfile):
+        if args.arrival not in PROFILE_MODES:
+            print(f"-arrival {args.arrival} cannot be used with a rate profile")
+            return
+        print(rate.describe())
+        requests_per_second = rate.mean_rate
+    else:
+        requests_per_second = rate
+
+    df = pd.read_csv(backend_class.url_file)
+    urls = df['URL'].tolist()
+
+    with open(log_file, mode='w') as file:
+        file.write('\t'.join(LOG_COLUMNS + backend_class.extra_columns) + '\n')
+    if args.arrow:
+        from trafgen_arrow import clear_results
+        clear_results(log_file)
+
+    if args.workers > 1:
+        stats = run_workers(partial(run_shard, backend_class, args, urls, rate), args.workers, number_of_requests,
+                            requests_per_second, log_file, seed=args.seed)
+    else:
+        shard = {'num_requests': number_of_requests, 'requests_per_second': requests_per_second,
+                 'seed': args.seed, 'log_file': log_file}
+        stats = run_shard(backend_class, args, urls, rate, shard)
+
+    total_data, average_data = calculate_totals_and_averages(stats)
+    average_phases = stats.phase_averages()
+    average_data += average_phases + stats.schedule_averages()
+
+    with open(log_file, mode='a') as file:
+        file.write('\t'.join(map(str, total_data)) + '\n')
+        file.write('\t'.join(map(str, average_data)) + '\n')
+        for row in stats.percentile_rows():
+            file.write('\t'.join(map(str, row)) + '\n')
+
+    print(f"Total RTT: {total_data[3]:.2f} ms, Total Throughput: {total_data[6]:.2f} bytes/ms")
+    print(f"Average RTT: {average_data[3]:.2f} ms, Average Throughput: {average_data[6]:.2f} bytes/ms")
+    print_phase_summary(average_phases)
+    stats.print_percentiles()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from trafgen_hist import is_success
+from trafgen_timing import start_timer
+
+MAX_PER_HOST = 6
+CHUNK_SIZE = 64 * 1024
+
+
+def is_html(headers):
+    """Hanya dokumen HTML (atau tanpa Content-Type) yang perlu di-buffer untuk dicari link-nya."""
+    content_type = headers.get('Content-Type', '')
+    return not content_type or 'html' in content_type.lower()
+
+
+def count_body(response, chunk_size=CHUNK_SIZE):
+    """Jumlah byte body (setelah decode Content-Encoding, sama seperti len(response.content)).
+
+    Body dibaca per chunk_size lalu langsung dibuang, jadi memori tetap
+    datar sebesar apa pun objeknya. response harus dibuat dengan stream=True.
+    """
+    return sum(len(chunk) for chunk in response.iter_content(chunk_size))
+
+
+def split_lanes(links, per_host=MAX_PER_HOST):
+    """Bagi link per host ke paling banyak per_host jalur, seperti batas koneksi per origin di browser."""
+    by_host = {}
+    for link in links:
+        by_host.setdefault(urlsplit(link).netloc, []).append(link)
+
+    lanes = []
+    for host_links in by_host.values():
+        width = min(per_host, len(host_links))
+        lanes.extend(host_links[i::width] for i in range(width))
+    return lanes
+
+
+class AssetFetcher:
+    """Ambil halaman lalu sub-resource-nya secara paralel.
+
+    Tiap jalur (lane) mengambil link-nya berurutan di satu thread, jadi per
+    halaman paling banyak per_host request berjalan bersamaan ke host yang
+    sama. Pool thread-nya terpisah dari executor make_request supaya tidak
+    ada task yang menunggu task lain di pool yang sama. Kalau manifest
+    (ManifestCache dari trafgen_manifest) diberikan, daftar sub-resource
+    halaman yang sama diambil dari cache tanpa decode dan parse HTML. Body
+    hanya di-buffer untuk dokumen utama HTML yang link-nya perlu dicari;
+    sisanya dihitung per chunk_size byte dengan count_body.
+    """
+
+    def __init__(self, per_host=MAX_PER_HOST, max_workers=None, manifest=None, chunk_size=CHUNK_SIZE,
+                 **request_kwargs):
+        self.per_host = per_host
+        self.manifest = manifest
+        self.chunk_size = chunk_size
+        self.request_kwargs = request_kwargs
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or 100 * per_host)
+
+    def _fetch_lane(self, session, lane):
+        content_size = 0
+        for link in lane:
+            try:
+                with session.get(link, stream=True, **self.request_kwargs) as response:
+                    content_size += count_body(response, self.chunk_size)
+            except requests.exceptions.RequestException:
+                pass
+        return content_size
+
+    def _links(self, url, response, extract_links):
+        if self.manifest is not None:
+            return self.manifest.links(url, response.headers, response.content, lambda: response.text, extract_links)
+        return extract_links(response.text, url)
+
+    def fetch_page(self, session, url, extract_links):
+        """Kembalikan (status, content_size, phases) untuk url dan semua sub-resource-nya.
+
+        status adalah status HTTP dokumen utama; sub-resource hanya diambil
+        kalau statusnya sukses (is_success dari trafgen_hist). phases berisi
+        nilai kolom PHASE_COLUMNS (trafgen_timing) untuk dokumen utama: TTFB
+        (sampai header diterima), DNS, Connect, TLS dan Transfer body.
+        DNS/Connect/TLS hanya terukur kalau session memakai PooledAdapter
+        (trafgen_pool). Kegagalan dokumen utama (RequestException) diteruskan
+        ke pemanggil; kegagalan sub-resource hanya membuatnya tidak terhitung.
+        """
+        timer = start_timer()
+        request_start = time.perf_counter()
+        with session.get(url, stream=True, **self.request_kwargs) as response:
+            status = response.status_code
+            html = is_html(response.headers) and is_success(status)
+            links = None
+            if html and self.manifest is not None:
+                links = self.manifest.etag_links(url, response.headers)
+            if html and links is None:
+                content_size = len(response.content)
+                links = self._links(url, response, extract_links)
+            else:
+                content_size = count_body(response, self.chunk_size)
+            total = (time.perf_counter() - request_start) * 1000
+        ttfb = response.elapsed.total_seconds() * 1000
+        phases = [ttfb, timer.dns, timer.connect, timer.tls, max(total - ttfb, 0)]
+
+        lanes = split_lanes(links or [], self.per_host)
+        futures = [self.executor.submit(self._fetch_lane, session, lane) for lane in lanes]
+        content_size += sum(future.result() for future in futures)
+        return status, content_size, phases
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,128 @@
+import csv
+import hashlib
+import os
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = '.trafgen_cache'
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, mode='rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def array_digest(array):
+    return hashlib.blake2b(np.ascontiguousarray(array).tobytes(), digest_size=16).hexdigest()
+
+
+class ForecastService:
+    """Forecast rate dari model (joblib) untuk seluruh horizon di data_file, dengan cache di disk.
+
+    Hasil prediksi disimpan di cache_dir per hash isi model dan kolom fitur;
+    kalau hash input sama, model tidak dimuat sama sekali (joblib, pandas
+    dan sklearn tidak diimpor). Kalau data_file hanya bertambah baris di
+    belakang, hanya baris baru yang diprediksi. forecast() bisa dipanggil
+    ulang selama run; selama data_file tidak berubah (mtime dan ukuran)
+    hasil di memori langsung dipakai. cache_dir=None mematikan cache di disk.
+    """
+
+    def __init__(self, model_file, data_file, feature_columns, time_column='timestamp',
+                 cache_dir=DEFAULT_CACHE_DIR):
+        self.model_file = model_file
+        self.data_file = data_file
+        self.feature_columns = list(feature_columns)
+        self.time_column = time_column
+        self.cache_dir = cache_dir
+        self.model_hash = file_digest(model_file)
+        self._model = None
+        self._data_stat = None
+        self._result = None
+        self.last_status = None
+
+    def _cache_file(self):
+        key = hashlib.blake2b(f"{self.model_hash}:{','.join(self.feature_columns)}".encode(),
+                              digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"forecast-{key}.npz")
+
+    def _read_data(self):
+        timestamps = []
+        rows = []
+        with open(self.data_file, newline='') as file:
+            for record in csv.DictReader(file):
+                timestamps.append(record[self.time_column])
+                rows.append([float(record[column]) for column in self.feature_columns])
+        return np.array(timestamps), np.array(rows, dtype=float).reshape(-1, len(self.feature_columns))
+
+    def _load_cache(self):
+        if self.cache_dir is None:
+            return None
+        try:
+            with np.load(self._cache_file()) as cached:
+                return {name: cached[name] for name in cached.files}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_cache(self, features, predictions, input_hash):
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_file()
+        temp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temp, features=features, predictions=predictions, input_hash=np.array(input_hash))
+        os.replace(temp, path)
+
+    def _predict(self, features):
+        # joblib/sklearn dan pandas hanya diimpor kalau memang ada baris yang
+        # harus diprediksi; model dilatih dengan DataFrame, jadi nama kolomnya
+        # ikut diberikan
+        if self._model is None:
+            from joblib import load
+            self._model = load(self.model_file)
+        import pandas as pd
+        frame = pd.DataFrame(features, columns=self.feature_columns)
+        return np.asarray(self._model.predict(frame), dtype=float)
+
+    def forecast(self):
+        """Kembalikan (timestamps, rates) untuk semua baris data_file; last_status berisi 'memory', 'hit', 'incremental' atau 'miss'."""
+        stat = os.stat(self.data_file)
+        data_stat = (stat.st_mtime_ns, stat.st_size)
+        if self._result is not None and data_stat == self._data_stat:
+            self.last_status = 'memory'
+            return self._result
+
+        timestamps, features = self._read_data()
+        input_hash = array_digest(features)
+        cached = self._load_cache()
+        if cached is not None and str(cached['input_hash']) == input_hash:
+            predictions = cached['predictions']
+            self.last_status = 'hit'
+        else:
+            # Panjang prefix yang sama dengan input yang sudah diprediksi
+            known = 0
+            if cached is not None:
+                old = cached['features']
+                limit = min(len(old), len(features))
+                same = np.all(old[:limit] == features[:limit], axis=1)
+                known = limit if same.all() else int(np.argmin(same))
+            if known == len(features):
+                predictions = cached['predictions'][:known]
+                self.last_status = 'hit'
+            elif known:
+                predictions = np.concatenate((cached['predictions'][:known], self._predict(features[known:])))
+                self.last_status = 'incremental'
+            else:
+                predictions = self._predict(features)
+                self.last_status = 'miss'
+            self._save_cache(features, predictions, input_hash)
+
+        self._data_stat = data_stat
+        self._result = (timestamps, predictions)
+        return self._result
+
+    def report(self):
+        rows = len(self._result[1]) if self._result is not None else 0
+        print(f"Forecast: {rows} rows from {self.data_file} ({self.last_status})")
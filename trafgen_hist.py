@@ -0,0 +1,210 @@
+import math
+import threading
+
+import numpy as np
+
+from trafgen_sched import SCHEDULE_COLUMNS
+from trafgen_timing import EMPTY_PHASES, PHASE_COLUMNS
+
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+FIRST_PHASE_COLUMN = 7
+FIRST_SCHEDULE_COLUMN = FIRST_PHASE_COLUMN + len(PHASE_COLUMNS)
+
+
+def is_success(status):
+    """Status Code yang bukan error: HTTP 2xx atau 304 (Not Modified).
+
+    Status lain, termasuk "Failed: ..." dari request yang raise, dihitung error.
+    """
+    return isinstance(status, int) and (200 <= status < 300 or status == 304)
+
+
+class LatencyHistogram:
+    """Histogram latency gaya HDR dengan memori tetap.
+
+    Nilai disimpan dalam mikrodetik di bucket log-linear: tiap pangkat dua
+    dibagi 2^(sub_bucket_bits - 1) sub-bucket, jadi galat relatifnya paling
+    besar 2^-(sub_bucket_bits - 1) (default ~0.1%). Bucket disimpan jarang
+    (dict), jadi memorinya sebanding dengan jumlah bucket yang terisi, bukan
+    jumlah sampel. Dua histogram dengan sub_bucket_bits sama bisa di-merge.
+    """
+
+    def __init__(self, sub_bucket_bits=11):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + ((value >> shift) - self.half_count)
+
+    def _highest_equivalent(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        mantissa = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ms):
+        index = self._index(max(int(value_ms * 1000), 0))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def record_many(self, values_ms):
+        """Versi vektor dari record untuk array nilai ms (NaN dilewati), dipakai analyzer log."""
+        values_ms = np.asarray(values_ms, dtype=np.float64)
+        values_ms = values_ms[~np.isnan(values_ms)]
+        if not len(values_ms):
+            return
+        micros = np.maximum((values_ms * 1000).astype(np.int64), 0)
+        _, bit_length = np.frexp(micros.astype(np.float64))
+        shift = np.maximum(bit_length - self.sub_bucket_bits, 1)
+        indices = np.where(micros < self.sub_bucket_count, micros,
+                           self.sub_bucket_count + (shift - 1) * self.half_count
+                           + ((micros >> shift) - self.half_count))
+        for index, count in zip(*(array.tolist() for array in np.unique(indices, return_counts=True))):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += len(values_ms)
+        self.total += float(values_ms.sum())
+        self.min = min(self.min, float(values_ms.min()))
+        self.max = max(self.max, float(values_ms.max()))
+
+    def merge(self, other):
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Histogram dengan sub_bucket_bits berbeda tidak bisa di-merge")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, percentile):
+        if not self.count:
+            return 0.0
+        target = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index) / 1000, self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class RunStats:
+    """Agregat hasil run yang diisi langsung oleh make_request, pengganti list baris hasil.
+
+    Menyimpan jumlah request/error/byte, jumlah RTT dan throughput (untuk
+    baris Total/Average), rata-rata kolom fase, LatencyHistogram RTT
+    (service time) keseluruhan dan per URL, serta histogram Queue Delay dan
+    Corrected Latency (trafgen_sched.SCHEDULE_COLUMNS). Aman dipanggil dari
+    banyak thread, bisa di-pickle dan di-merge antar proses worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.total_bytes = 0
+        self.total_rtt = 0.0
+        self.total_throughput = 0.0
+        self.phase_sums = [0.0] * len(PHASE_COLUMNS)
+        self.phase_counts = [0] * len(PHASE_COLUMNS)
+        self.latency = LatencyHistogram()
+        self.queue_delay = LatencyHistogram()
+        self.corrected = LatencyHistogram()
+        self.per_url = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, row):
+        """Masukkan satu baris log (skema kolom yang sama dengan file log)."""
+        url, rtt, status, content_size, throughput = row[0], row[3], row[4], row[5], row[6]
+        phases = row[FIRST_PHASE_COLUMN:FIRST_SCHEDULE_COLUMN]
+        _, queue_delay, corrected = row[FIRST_SCHEDULE_COLUMN:FIRST_SCHEDULE_COLUMN + len(SCHEDULE_COLUMNS)]
+        with self._lock:
+            self.count += 1
+            if not is_success(status):
+                self.errors += 1
+            self.total_bytes += content_size
+            self.total_rtt += rtt
+            self.total_throughput += throughput
+            for index, value in enumerate(phases):
+                if value != '':
+                    self.phase_sums[index] += value
+                    self.phase_counts[index] += 1
+            self.latency.record(rtt)
+            self.queue_delay.record(queue_delay)
+            self.corrected.record(corrected)
+            if url not in self.per_url:
+                self.per_url[url] = LatencyHistogram(self.latency.sub_bucket_bits)
+            self.per_url[url].record(rtt)
+
+    def merge(self, other):
+        with self._lock:
+            self.count += other.count
+            self.errors += other.errors
+            self.total_bytes += other.total_bytes
+            self.total_rtt += other.total_rtt
+            self.total_throughput += other.total_throughput
+            for index in range(len(PHASE_COLUMNS)):
+                self.phase_sums[index] += other.phase_sums[index]
+                self.phase_counts[index] += other.phase_counts[index]
+            self.latency.merge(other.latency)
+            self.queue_delay.merge(other.queue_delay)
+            self.corrected.merge(other.corrected)
+            for url, histogram in other.per_url.items():
+                if url in self.per_url:
+                    self.per_url[url].merge(histogram)
+                else:
+                    self.per_url[url] = histogram
+        return self
+
+    def phase_averages(self):
+        return [total / count if count else 0 for total, count in zip(self.phase_sums, self.phase_counts)]
+
+    def schedule_averages(self):
+        """Nilai rata-rata untuk kolom SCHEDULE_COLUMNS ('' untuk Intended Start)."""
+        return ['', self.queue_delay.mean(), self.corrected.mean()]
+
+    def percentile_rows(self):
+        """Baris P50/P90/P99/P99.9/Max dengan tata letak log: RTT, Queue Delay dan Corrected Latency."""
+        def row(name, pick):
+            return ([name, "", "", pick(self.latency), "", "", ""] + EMPTY_PHASES
+                    + ["", pick(self.queue_delay), pick(self.corrected)])
+
+        rows = [row(f"P{p:g}", lambda histogram: histogram.percentile(p)) for p in REPORT_PERCENTILES]
+        rows.append(row("Max", lambda histogram: histogram.max))
+        return rows
+
+    def print_percentiles(self):
+        header = "".join(f"{'p' + format(p, 'g'):>10}" for p in REPORT_PERCENTILES) + f"{'max':>10}{'count':>9}"
+        print(f"{'Latency percentiles (ms)':<50}{header}")
+        histograms = [("Corrected (from intended start)", self.corrected),
+                      ("Queue delay", self.queue_delay),
+                      ("Service time (from actual start)", self.latency)]
+        histograms += sorted(self.per_url.items(), key=lambda item: -item[1].count)
+        for name, histogram in histograms:
+            values = "".join(f"{histogram.percentile(p):>10.2f}" for p in REPORT_PERCENTILES)
+            print(f"{str(name)[:49]:<50}{values}{histogram.max:>10.2f}{histogram.count:>9}")
@@ -0,0 +1,272 @@
+import ipaddress
+import os
+import select
+import selectors
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+
+from trafgen_hist import LatencyHistogram
+from trafgen_sources import resolve_source
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+SO_BINDTODEVICE = getattr(socket, 'SO_BINDTODEVICE', 25)
+
+
+def checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def echo_request(ident, sequence, payload):
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, sequence)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum(header + payload), ident, sequence) + payload
+
+
+def open_icmp_socket(source_ip, interface=None):
+    """Socket ICMP non-blocking yang terikat ke source_ip (dan ke interface kalau boleh).
+
+    Socket datagram (ping tanpa root, sesuai net.ipv4.ping_group_range)
+    dicoba dulu, lalu socket raw. Kembalikan (socket, raw).
+    """
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        raw = False
+    except PermissionError:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        raw = True
+    if interface is not None:
+        # Seperti ping -I <interface>; butuh CAP_NET_RAW, kalau tidak boleh
+        # cukup terikat ke IP-nya
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_BINDTODEVICE, interface.encode())
+        except OSError:
+            pass
+    sock.bind((source_ip, 0))
+    sock.setblocking(False)
+    return sock, raw
+
+
+def _replies(sock, raw, ident):
+    """Balasan echo yang sudah tiba di sock sebagai (alamat target, sequence)."""
+    while True:
+        try:
+            packet, (address, _) = sock.recvfrom(65535)
+        except BlockingIOError:
+            return
+        if raw:
+            packet = packet[(packet[0] & 0x0F) * 4:]
+        if len(packet) < 8:
+            continue
+        kind, _, _, reply_ident, sequence = struct.unpack('!BBHHH', packet[:8])
+        if kind != ICMP_ECHO_REPLY or (raw and reply_ident != ident):
+            continue
+        yield address, sequence
+
+
+def ping_once(address, source_ip='0.0.0.0', timeout=1.0, payload=bytes(56), sequence=0):
+    """Satu echo request ke address (IP) dari source_ip; kembalikan RTT dalam ms.
+
+    Blocking dan memakai socket sendiri, jadi aman dipanggil dari banyak
+    thread sekaligus (dipakai backend icmp di trafgen_backends). TimeoutError
+    kalau tidak ada balasan dalam timeout detik.
+    """
+    sock, raw = open_icmp_socket(source_ip)
+    try:
+        ident = (os.getpid() ^ threading.get_ident()) & 0xFFFF
+        sent_at = time.perf_counter()
+        sock.sendto(echo_request(ident, sequence, payload), (address, 0))
+        deadline = sent_at + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                raise TimeoutError(f"no echo reply from {address} within {timeout:g} s")
+            for reply_address, reply_sequence in _replies(sock, raw, ident):
+                if reply_address == address and reply_sequence == sequence:
+                    return (time.perf_counter() - sent_at) * 1000
+    finally:
+        sock.close()
+
+
+class ProbeResult:
+    """Hasil satu echo request; rtt_ms None berarti tidak ada balasan sebelum timeout (loss)."""
+
+    __slots__ = ('source', 'target', 'sequence', 'sent', 'rtt_ms')
+
+    def __init__(self, source, target, sequence, sent, rtt_ms):
+        self.source = source
+        self.target = target
+        self.sequence = sequence
+        self.sent = sent
+        self.rtt_ms = rtt_ms
+
+    def __repr__(self):
+        rtt = f"{self.rtt_ms:.3f} ms" if self.rtt_ms is not None else "timeout"
+        return f"{self.source} -> {self.target} seq={self.sequence} {rtt}"
+
+
+class ProbeStats:
+    """Ringkasan per pasangan (sumber, target): loss, min/avg/max, jitter dan persentil RTT.
+
+    Jitter adalah rata-rata selisih absolut RTT dua balasan berturutan
+    (seperti mdev di ping / jitter RFC 3550 tanpa smoothing).
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.rtt = LatencyHistogram()
+        self.min = float('inf')
+        self.max = 0.0
+        self._jitter_total = 0.0
+        self._jitter_count = 0
+        self._last_rtt = None
+
+    def record(self, rtt_ms):
+        self.sent += 1
+        if rtt_ms is None:
+            return
+        self.received += 1
+        self.rtt.record(rtt_ms)
+        self.min = min(self.min, rtt_ms)
+        self.max = max(self.max, rtt_ms)
+        if self._last_rtt is not None:
+            self._jitter_total += abs(rtt_ms - self._last_rtt)
+            self._jitter_count += 1
+        self._last_rtt = rtt_ms
+
+    @property
+    def loss(self):
+        return 1 - self.received / self.sent if self.sent else 0.0
+
+    @property
+    def jitter(self):
+        return self._jitter_total / self._jitter_count if self._jitter_count else 0.0
+
+    def summary(self):
+        return {'sent': self.sent, 'received': self.received, 'loss': self.loss,
+                'min_ms': self.min if self.received else 0.0, 'avg_ms': self.rtt.mean(), 'max_ms': self.max,
+                'p50_ms': self.rtt.percentile(50), 'p99_ms': self.rtt.percentile(99), 'jitter_ms': self.jitter}
+
+
+class IcmpProber:
+    """Ping banyak target dari banyak sumber sekaligus dalam satu thread.
+
+    sources berisi IP atau nama interface (misal uesimtun0); tiap sumber
+    punya satu socket dan tiap pasangan (sumber, target) mengirim echo
+    request tiap interval detik dengan jadwal absolut (digeser sedikit per
+    pasangan supaya tidak serentak). count membatasi jumlah probe per
+    pasangan, duration membatasi lama pengiriman; salah satunya harus ada.
+    probe() adalah generator ProbeResult yang keluar begitu balasan datang
+    atau timeout habis; stats berisi ProbeStats per pasangan. Target yang
+    resolve ke IP yang sama ditolak (ValueError).
+    """
+
+    def __init__(self, targets, sources=(None,), interval=1.0, count=None, duration=None, timeout=1.0,
+                 payload_size=56):
+        if count is None and duration is None:
+            raise ValueError("count atau duration harus diberikan")
+        self.targets = [(target, socket.gethostbyname(target)) for target in targets]
+        # Balasan dicocokkan lewat (socket, alamat, sequence), jadi dua target
+        # dengan IP yang sama tidak bisa dibedakan
+        seen = {}
+        for target, address in self.targets:
+            if address in seen:
+                raise ValueError(f"Target {seen[address]} dan {target} sama-sama {address}")
+            seen[address] = target
+        self.interval = interval
+        self.count = count
+        self.duration = duration
+        self.timeout = timeout
+        self.payload = bytes(payload_size)
+        self.sockets = []
+        for spec in sources:
+            source_ip = resolve_source(spec) if spec is not None else '0.0.0.0'
+            interface = spec if spec is not None and not _is_ip(spec) else None
+            sock, raw = open_icmp_socket(source_ip, interface)
+            label = spec if spec is not None else 'default'
+            # ident socket raw dibedakan per socket; socket datagram diisi kernel
+            self.sockets.append((label, sock, raw, (os.getpid() + len(self.sockets)) & 0xFFFF))
+        self.stats = {(label, target): ProbeStats() for label, *_ in self.sockets for target, _ in self.targets}
+
+    def close(self):
+        for _, sock, _, _ in self.sockets:
+            sock.close()
+
+    def probe(self):
+        pairs = [(index, target, address) for index in range(len(self.sockets)) for target, address in self.targets]
+        selector = selectors.DefaultSelector()
+        for index, (_, sock, _, _) in enumerate(self.sockets):
+            selector.register(sock, selectors.EVENT_READ, index)
+
+        start = time.perf_counter()
+        stop = start + self.duration if self.duration is not None else float('inf')
+        stagger = self.interval / len(pairs)
+        next_send = [start + i * stagger for i in range(len(pairs))]
+        sent = [0] * len(pairs)
+        # (index socket, alamat target, sequence) -> (target, waktu kirim, datetime kirim)
+        pending = {}
+        try:
+            while True:
+                now = time.perf_counter()
+                for i, (index, target, address) in enumerate(pairs):
+                    if next_send[i] <= now and next_send[i] < stop and (self.count is None or sent[i] < self.count):
+                        label, sock, _, ident = self.sockets[index]
+                        sequence = sent[i] & 0xFFFF
+                        try:
+                            sock.sendto(echo_request(ident, sequence, self.payload), (address, 0))
+                            pending[(index, address, sequence)] = (target, time.perf_counter(), datetime.now())
+                        except OSError:
+                            self.stats[(label, target)].record(None)
+                            yield ProbeResult(label, target, sequence, datetime.now(), None)
+                        sent[i] += 1
+                        next_send[i] += self.interval
+
+                for key, (target, sent_at, sent_time) in list(pending.items()):
+                    if now - sent_at > self.timeout:
+                        del pending[key]
+                        label = self.sockets[key[0]][0]
+                        self.stats[(label, target)].record(None)
+                        yield ProbeResult(label, target, key[2], sent_time, None)
+
+                sending = [t for i, t in enumerate(next_send)
+                           if t < stop and (self.count is None or sent[i] < self.count)]
+                if not sending and not pending:
+                    return
+                wake = min(sending + [sent_at + self.timeout for _, sent_at, _ in pending.values()])
+                for key, _ in selector.select(max(wake - time.perf_counter(), 0)):
+                    index = key.data
+                    label, sock, raw, ident = self.sockets[index]
+                    for address, sequence in _replies(sock, raw, ident):
+                        match = pending.pop((index, address, sequence), None)
+                        if match is None:
+                            continue
+                        target, sent_at, sent_time = match
+                        rtt_ms = (time.perf_counter() - sent_at) * 1000
+                        self.stats[(label, target)].record(rtt_ms)
+                        yield ProbeResult(label, target, sequence, sent_time, rtt_ms)
+        finally:
+            selector.close()
+
+    def print_summary(self):
+        print(f"{'source':<16}{'target':<28}{'sent':>6}{'recv':>6}{'loss %':>8}{'min':>9}{'avg':>9}"
+              f"{'max':>9}{'p99':>9}{'jitter':>9}")
+        for (label, target), stats in self.stats.items():
+            s = stats.summary()
+            print(f"{label[:15]:<16}{target[:27]:<28}{s['sent']:>6}{s['received']:>6}{s['loss'] * 100:>8.1f}"
+                  f"{s['min_ms']:>9.2f}{s['avg_ms']:>9.2f}{s['max_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['jitter_ms']:>9.2f}")
+
+
+def _is_ip(spec):
+    try:
+        ipaddress.ip_address(spec)
+        return True
+    except ValueError:
+        return False
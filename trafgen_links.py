@@ -0,0 +1,129 @@
+import re
+from urllib.parse import urljoin, urlsplit
+
+# Satu regex, satu pass. Semua cabang diawali '<' supaya re bisa langsung
+# melompat ke '<' berikutnya: komentar dilewati, isi <script> dilewati dan
+# isi <style> dicari url()/@import-nya, tag yang bisa memuat resource
+# diambil atributnya, dan tag lain hanya diambil kalau punya style="...".
+_ATTRS = r'''[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*'''
+_TOKEN = re.compile(r'''
+    <(?:
+        !--.*?-->
+      | (?P<raw>script|style)\b(?P<raw_attrs>%(attrs)s)>(?P<body>.*?)</(?P=raw)\s*>
+      | (?P<tag>img|source|script|iframe|embed|link|base|video|audio|track|input|object)\b(?P<attrs>%(attrs)s)>
+      | [a-z][\w:-]*\s(?=[^>]*?style\s*=)(?P<styled_attrs>%(attrs)s)>
+    )''' % {'attrs': _ATTRS}, re.S | re.I | re.X)
+_ATTR = re.compile(r'''([^\s"'>/=]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
+_CSS_URL = re.compile(r'''url\(\s*(?:"([^"]*)"|'([^']*)'|([^)\s]*))\s*\)|@import\s+(?:"([^"]*)"|'([^']*)')''', re.I)
+
+# Atribut yang langsung memuat resource untuk tiap tag
+_SRC_ATTRS = {
+    'img': ('src',), 'source': ('src',), 'script': ('src',), 'iframe': ('src',), 'embed': ('src',),
+    'video': ('src', 'poster'), 'audio': ('src',), 'track': ('src',), 'object': ('data',),
+}
+# <link rel=...> yang diambil browser saat memuat halaman; canonical,
+# alternate, preconnect dan sejenisnya bukan resource
+_LINK_RELS = {'stylesheet', 'icon', 'shortcut', 'apple-touch-icon', 'preload', 'modulepreload', 'manifest'}
+_SKIP_SCHEMES = ('data:', 'javascript:', 'about:', 'blob:', 'mailto:', 'tel:', '#')
+
+
+def _attributes(text):
+    attributes = {}
+    for name, dq, sq, bare in _ATTR.findall(text):
+        attributes.setdefault(name.lower(), dq or sq or bare)
+    return attributes
+
+
+def _srcset_candidate(srcset):
+    """Browser hanya mengambil satu kandidat srcset; di sini yang descriptor-nya (w atau x) terbesar."""
+    best, best_size = None, -1.0
+    for candidate in srcset.split(','):
+        parts = candidate.split()
+        if not parts:
+            continue
+        try:
+            size = float(parts[1][:-1]) if len(parts) > 1 else 1.0
+        except ValueError:
+            size = 1.0
+        if size > best_size:
+            best, best_size = parts[0], size
+    return best
+
+
+def css_links(css):
+    """URL mentah dari url(...) dan @import "..." di teks CSS."""
+    # Tiap match hanya mengisi satu grup, jadi join cukup untuk mengambilnya
+    return [''.join(match) for match in _CSS_URL.findall(css)]
+
+
+def _tag_links(tag, attributes):
+    if tag == 'link':
+        rels = set(attributes.get('rel', '').lower().split())
+        return [attributes['href']] if rels & _LINK_RELS and 'href' in attributes else []
+    if tag == 'input':
+        is_image = attributes.get('type', '').lower() == 'image'
+        return [attributes['src']] if is_image and 'src' in attributes else []
+
+    links = []
+    if 'srcset' in attributes and tag in ('img', 'source'):
+        candidate = _srcset_candidate(attributes['srcset'])
+        if candidate:
+            links.append(candidate)
+    else:
+        links.extend(attributes[name] for name in _SRC_ATTRS.get(tag, ()) if name in attributes)
+    return links
+
+
+def extract_links(html, base_url):
+    """Resource yang dimuat browser bersama halaman (gambar, script, stylesheet, media, iframe, url() CSS).
+
+    Link <a href> dan <link rel> non-resource tidak diambil. <base href>
+    dipakai untuk seluruh dokumen seperti di browser. Hasil berupa URL
+    absolut http(s), tanpa duplikat, urut kemunculan.
+    """
+    raw_links = []
+    base = base_url
+    found_base = False
+    for match in _TOKEN.finditer(html):
+        kind = match.lastgroup
+        if kind == 'body':
+            if match.group('raw').lower() == 'script':
+                raw_links.extend(_tag_links('script', _attributes(match.group('raw_attrs'))))
+            else:
+                raw_links.extend(css_links(match.group('body')))
+        elif kind == 'attrs':
+            tag = match.group('tag').lower()
+            attributes = _attributes(match.group('attrs'))
+            if tag == 'base':
+                if not found_base and 'href' in attributes:
+                    base = urljoin(base_url, attributes['href'].strip())
+                    found_base = True
+            else:
+                raw_links.extend(_tag_links(tag, attributes))
+            if 'style' in attributes:
+                raw_links.extend(css_links(attributes['style']))
+        elif kind == 'styled_attrs':
+            style = _attributes(match.group('styled_attrs')).get('style')
+            if style:
+                raw_links.extend(css_links(style))
+
+    # urljoin relatif mahal, jadi bentuk yang paling umum (absolut, //host/...
+    # dan /path tanpa segmen titik) digabung langsung
+    parts = urlsplit(base)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    links = {}
+    for link in dict.fromkeys(raw_links):
+        link = link.strip()
+        if link.startswith(('http://', 'https://')):
+            absolute = link
+        elif not link or link.lower().startswith(_SKIP_SCHEMES):
+            continue
+        elif link.startswith('//'):
+            absolute = f"{parts.scheme}:{link}"
+        elif link.startswith('/') and '/.' not in link:
+            absolute = origin + link
+        else:
+            absolute = urljoin(base, link)
+        if absolute.startswith(('http://', 'https://')):
+            links.setdefault(absolute, None)
+    return list(links)
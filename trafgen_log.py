@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class TsvSink:
+    """Sink default LogWriter: baris dipisah tab, satu write() per batch."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, mode='a')
+
+    def write_rows(self, rows):
+        self._file.write(''.join('\t'.join(map(str, row)) + '\n' for row in rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class LogWriter:
+    """Penulis log di thread sendiri, pengganti open/append/close per request di log_to_log.
+
+    write() hanya memasukkan baris ke queue berukuran max_queue; thread
+    penulis mengumpulkannya sampai batch_size baris atau flush_interval
+    detik, lalu meneruskan batch itu ke TsvSink(filename) dan ke tiap sink
+    tambahan di sinks (objek dengan write_rows(rows) dan close(), misalnya
+    ArrowSink dari trafgen_arrow). Karena hanya thread ini yang menulis ke
+    file, baris tidak pernah bercampur. Kalau disk tidak mengejar dan queue penuh, drop=False membuat
+    write() menunggu (backpressure, waktunya dicatat), drop=True membuang
+    barisnya (jumlahnya dicatat). Di engine async, menunggu berarti event loop
+    ikut tertahan, jadi pengiriman request melambat alih-alih memori membengkak.
+    Kalau sink raise (disk penuh, skema Arrow tidak cocok), thread penulis
+    tetap mengosongkan queue dan error-nya di-raise ulang sebagai
+    RuntimeError dari write() dan close().
+    """
+
+    def __init__(self, filename, max_queue=100000, batch_size=1000, flush_interval=1.0, drop=False, sinks=()):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop = drop
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.blocked_time = 0.0
+        self.max_blocked = 0.0
+        self.max_depth = 0
+        self.error = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        self.sinks = [TsvSink(filename)] + list(sinks)
+        self._thread = threading.Thread(target=self._run, name=f"LogWriter({filename})", daemon=True)
+        self._thread.start()
+
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError(f"Log writer ({self.filename}) stopped: {self.error!r}") from self.error
+
+    def write(self, row):
+        self._check()
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            if self.drop:
+                with self._lock:
+                    self.dropped += 1
+                return
+            start = time.perf_counter()
+            self.queue.put(row)
+            waited = time.perf_counter() - start
+            with self._lock:
+                self.blocked += 1
+                self.blocked_time += waited
+                self.max_blocked = max(self.max_blocked, waited)
+            self._check()
+
+    def _run(self):
+        try:
+            self._write_rows()
+        except Exception as e:
+            self.error = e
+            # Baris berikutnya dibuang supaya write() yang sedang menunggu
+            # queue tidak macet; error-nya dilaporkan oleh write()/close()
+            while not self._stopped:
+                self._stopped = self.queue.get() is _STOP
+
+    def _write_rows(self):
+        rows = []
+        deadline = time.perf_counter() + self.flush_interval
+        while True:
+            try:
+                row = self.queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                row = None
+            if row is _STOP:
+                self._stopped = True
+                break
+            if row is not None:
+                self.max_depth = max(self.max_depth, self.queue.qsize())
+                rows.append(row)
+            if len(rows) >= self.batch_size or time.perf_counter() >= deadline:
+                self._flush(rows)
+                rows = []
+                deadline = time.perf_counter() + self.flush_interval
+        self._flush(rows)
+
+    def _flush(self, rows):
+        if rows:
+            for sink in self.sinks:
+                sink.write_rows(rows)
+            self.written += len(rows)
+
+    def close(self):
+        """Tulis sisa baris, tutup semua sink dan kembalikan statistik penulis."""
+        self.queue.put(_STOP)
+        self._thread.join()
+        for sink in self.sinks:
+            sink.close()
+        report = self.report()
+        self._check()
+        return report
+
+    def report(self):
+        print(f"Log writer ({self.filename}): {self.written} rows written, {self.dropped} dropped, "
+              f"{self.blocked} writes blocked ({self.blocked_time * 1000:.2f} ms total, "
+              f"max {self.max_blocked * 1000:.2f} ms), max queue depth {self.max_depth}")
+        return {'written': self.written, 'dropped': self.dropped, 'blocked': self.blocked,
+                'blocked_ms': self.blocked_time * 1000, 'max_depth': self.max_depth}
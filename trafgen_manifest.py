@@ -0,0 +1,85 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class ManifestCache:
+    """Cache LRU daftar sub-resource per halaman supaya HTML yang sama tidak di-decode dan di-parse ulang.
+
+    Key-nya (url, validator): ETag dari response kalau ada, selain itu hash
+    blake2b isi body, jadi halaman yang berubah otomatis jadi entri baru.
+    Entri lebih tua dari ttl detik dianggap miss. maxsize=0 mematikan cache.
+    Aman dipakai dari banyak thread.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _validator(headers, body):
+        etag = headers.get('ETag')
+        if etag:
+            return 'etag', etag
+        return 'blake2b', hashlib.blake2b(body, digest_size=16).digest()
+
+    def _lookup(self, key, count_miss=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                links, expires = entry
+                if time.monotonic() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return links
+                del self._entries[key]
+                self.expired += 1
+            if count_miss:
+                self.misses += 1
+            return None
+
+    def _store(self, key, links):
+        with self._lock:
+            self._entries[key] = (links, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def etag_links(self, url, headers):
+        """Daftar sub-resource dari cache hanya dengan ETag, sebelum body dibaca, atau None.
+
+        Kalau None, body perlu dibaca lalu links() dipanggil (yang mencatat
+        miss-nya); kalau hit, body cukup dihitung tanpa disimpan.
+        """
+        etag = headers.get('ETag')
+        if self.maxsize <= 0 or not etag:
+            return None
+        return self._lookup((url, 'etag', etag), count_miss=False)
+
+    def links(self, url, headers, body, decode, extract_links):
+        """Daftar sub-resource untuk halaman url.
+
+        decode() baru dipanggil (dan extract_links dijalankan) kalau cache
+        miss; saat hit hanya validator yang dihitung.
+        """
+        if self.maxsize <= 0:
+            return extract_links(decode(), url)
+        key = (url,) + self._validator(headers, body)
+        links = self._lookup(key)
+        if links is None:
+            links = extract_links(decode(), url)
+            self._store(key, links)
+        return links
+
+    def report(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        print(f"Manifest cache: {self.hits} hits, {self.misses} misses ({self.expired} expired), "
+              f"hit rate {hit_rate * 100:.2f}%, {len(self._entries)}/{self.maxsize} entries")
+        return {'hits': self.hits, 'misses': self.misses, 'expired': self.expired, 'hit_rate': hit_rate}
@@ -0,0 +1,236 @@
+import bisect
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from trafgen_hist import FIRST_SCHEDULE_COLUMN, is_success
+from trafgen_sched import SCHEDULE_COLUMNS
+
+# Batas bucket histogram dalam detik (konvensi Prometheus)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CORRECTED_COLUMN = FIRST_SCHEDULE_COLUMN + SCHEDULE_COLUMNS.index('Corrected Latency (ms)')
+SOURCE_COLUMN = FIRST_SCHEDULE_COLUMN + len(SCHEDULE_COLUMNS)
+
+
+def _labels(**labels):
+    parts = []
+    for name, value in labels.items():
+        if value is None or value == '':
+            continue
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'sum', 'count')
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def render(self, name, **labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(**labels, le=format(bound, 'g'))} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {self.count}")
+        lines.append(f"{name}_sum{_labels(**labels)} {self.sum:.6f}")
+        lines.append(f"{name}_count{_labels(**labels)} {self.count}")
+        return lines
+
+
+class _Series:
+    """Counter dan histogram RTT untuk satu pasangan (url, source IP)."""
+
+    __slots__ = ('ok', 'errors', 'bytes', 'latency')
+
+    def __init__(self):
+        self.ok = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = _Histogram()
+
+
+class Metrics:
+    """Counter dan gauge selama run untuk diekspos dalam format teks Prometheus.
+
+    observe(row) dipanggil untuk tiap baris log (lihat MeteredLog), termasuk
+    baris request yang raise; status yang tidak lolos is_success (trafgen_hist)
+    dihitung error. Jumlah request terkirim dibaca dari scheduler
+    (ArrivalScheduler dan turunannya), in-flight = terkirim - selesai, dan
+    antrian executor = in-flight yang melebihi concurrency (max_workers
+    executor atau -inflight). Gauge *_rps
+    dan bytes_per_second dihitung dari sampel tiap detik selama window detik
+    terakhir; untuk rate per URL/source pakai rate() atas counter-nya.
+    """
+
+    def __init__(self, scheduler=None, concurrency=None, window=10.0):
+        self.scheduler = scheduler
+        self.concurrency = concurrency
+        self.window = window
+        self.completed = 0
+        self.errors = 0
+        self.bytes = 0
+        self.series = {}
+        self.corrected = _Histogram()
+        self._samples = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, row):
+        url, rtt, status, content_size = row[0], row[3], row[4], row[5]
+        source = row[SOURCE_COLUMN] if len(row) > SOURCE_COLUMN else None
+        with self._lock:
+            series = self.series.get((url, source))
+            if series is None:
+                series = self.series[(url, source)] = _Series()
+            self.completed += 1
+            self.bytes += content_size
+            series.bytes += content_size
+            if is_success(status):
+                series.ok += 1
+            else:
+                series.errors += 1
+                self.errors += 1
+            series.latency.observe(rtt / 1000)
+            self.corrected.observe(row[CORRECTED_COLUMN] / 1000)
+
+    def _sent(self):
+        return self.scheduler.sent if self.scheduler is not None else self.completed
+
+    def sample(self):
+        """Ambil satu sampel untuk gauge rolling; dipanggil tiap detik oleh MetricsServer."""
+        now = time.monotonic()
+        with self._lock:
+            self._samples.append((now, self._sent(), self.completed, self.bytes))
+            while len(self._samples) > 1 and self._samples[0][0] < now - self.window:
+                self._samples.popleft()
+
+    def rolling(self):
+        """(sent_rps, achieved_rps, bytes_per_second) selama window terakhir."""
+        with self._lock:
+            if len(self._samples) < 2:
+                return 0.0, 0.0, 0.0
+            (t0, sent0, done0, bytes0), (t1, sent1, done1, bytes1) = self._samples[0], self._samples[-1]
+        seconds = t1 - t0
+        return (sent1 - sent0) / seconds, (done1 - done0) / seconds, (bytes1 - bytes0) / seconds
+
+    def _offered(self):
+        scheduler = self.scheduler
+        if scheduler is None or scheduler.t0 is None or scheduler.mode == 'trace':
+            return None
+        profile = getattr(scheduler, 'profile', None)
+        if profile is not None:
+            return float(profile.rate_at(time.perf_counter() - scheduler.t0))
+        return scheduler.rate
+
+    def render(self):
+        sent_rps, achieved_rps, bytes_per_second = self.rolling()
+        sent = self._sent()
+        with self._lock:
+            in_flight = max(sent - self.completed, 0)
+            lines = []
+
+            def metric(name, kind, help_text, samples):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(samples)
+
+            metric('trafgen_requests_sent_total', 'counter', 'Requests dispatched by the scheduler.',
+                   [f"trafgen_requests_sent_total {sent}"])
+            metric('trafgen_requests_total', 'counter', 'Completed requests by URL, source IP and result.',
+                   [f"trafgen_requests_total{_labels(url=url, source=source, result=result)} {count}"
+                    for (url, source), series in self.series.items()
+                    for result, count in (('ok', series.ok), ('error', series.errors)) if count])
+            metric('trafgen_response_bytes_total', 'counter', 'Bytes received (page and sub-resources) by URL and source IP.',
+                   [f"trafgen_response_bytes_total{_labels(url=url, source=source)} {series.bytes}"
+                    for (url, source), series in self.series.items()])
+            metric('trafgen_errors_total', 'counter', 'Failed requests.', [f"trafgen_errors_total {self.errors}"])
+            metric('trafgen_in_flight', 'gauge', 'Requests dispatched but not completed.', [f"trafgen_in_flight {in_flight}"])
+            if self.concurrency is not None:
+                metric('trafgen_queue_depth', 'gauge', 'In-flight requests waiting for a free worker.',
+                       [f"trafgen_queue_depth {max(in_flight - self.concurrency, 0)}"])
+            offered = self._offered()
+            if offered is not None:
+                metric('trafgen_offered_rps', 'gauge', 'Scheduled request rate.', [f"trafgen_offered_rps {offered:.6g}"])
+            metric('trafgen_sent_rps', 'gauge', f'Dispatch rate over the last {self.window:g} s.',
+                   [f"trafgen_sent_rps {sent_rps:.6g}"])
+            metric('trafgen_achieved_rps', 'gauge', f'Completion rate over the last {self.window:g} s.',
+                   [f"trafgen_achieved_rps {achieved_rps:.6g}"])
+            metric('trafgen_bytes_per_second', 'gauge', f'Receive rate over the last {self.window:g} s.',
+                   [f"trafgen_bytes_per_second {bytes_per_second:.6g}"])
+            samples = []
+            for (url, source), series in self.series.items():
+                samples.extend(series.latency.render('trafgen_request_duration_seconds', url=url, source=source))
+            metric('trafgen_request_duration_seconds', 'histogram', 'Service time (RTT from actual start) by URL and source IP.',
+                   samples)
+            metric('trafgen_corrected_latency_seconds', 'histogram', 'Latency from the intended start (includes queueing in the generator).',
+                   self.corrected.render('trafgen_corrected_latency_seconds'))
+        return '\n'.join(lines) + '\n'
+
+
+class MeteredLog:
+    """Bungkus LogWriter (trafgen_log) supaya tiap baris juga masuk ke Metrics."""
+
+    def __init__(self, log, metrics):
+        self.log = log
+        self.metrics = metrics
+
+    def write(self, row):
+        self.metrics.observe(row)
+        self.log.write(row)
+
+    def close(self):
+        self.log.close()
+
+
+class MetricsServer:
+    """Endpoint HTTP /metrics untuk Metrics di thread sendiri, plus thread sampler tiap detik."""
+
+    def __init__(self, metrics, port=9100, host='127.0.0.1'):
+        self.metrics = metrics
+        metrics_ref = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics_ref.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._server.serve_forever, daemon=True),
+                         threading.Thread(target=self._sample, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        print(f"Metrics on http://{host}:{port}/metrics")
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.metrics.sample()
+            self._stop.wait(1.0)
+
+    def close(self):
+        self._stop.set()
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import csv
+import random
+import ssl
+
+from aiohttp import web
+
+CERT_FILE = '10.10.200.1.pem'
+KEY_FILE = '10.10.200.1-key.pem'
+ASSET_TYPES = (('png', 'image/png', '<img src="/asset/{i}.png" alt="">'),
+               ('js', 'application/javascript', '<script src="/asset/{i}.js"></script>'),
+               ('css', 'text/css', '<link rel="stylesheet" href="/asset/{i}.css">'))
+
+
+class OriginConfig:
+    """Bentuk situs sintetis: pages halaman HTML sekitar page_size byte, masing-masing memuat
+    assets sub-resource (gambar, script, stylesheet bergantian) sebesar asset_size byte.
+
+    Asset dipakai bersama oleh semua halaman seperti di situs sungguhan.
+    Tiap response ditahan delay_ms ditambah jitter eksponensial dengan
+    rata-rata jitter_ms untuk meniru latensi server/jaringan.
+    """
+
+    def __init__(self, pages=100, page_size=20000, assets=10, asset_size=50000, delay_ms=0.0, jitter_ms=0.0,
+                 seed=None):
+        self.pages = pages
+        self.page_size = page_size
+        self.assets = assets
+        self.asset_size = asset_size
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.rng = random.Random(seed)
+
+    def delay(self):
+        delay = self.delay_ms
+        if self.jitter_ms > 0:
+            delay += self.rng.expovariate(1 / self.jitter_ms)
+        return delay / 1000
+
+
+def page_html(index, config):
+    links = ''.join(ASSET_TYPES[i % len(ASSET_TYPES)][2].format(i=i) for i in range(config.assets))
+    head = f'<html><head><title>page {index}</title></head><body>{links}<p>'
+    tail = '</p></body></html>'
+    padding = max(config.page_size - len(head) - len(tail), 0)
+    filler = ('lorem ipsum dolor sit amet ' * (padding // 27 + 1))[:padding]
+    body = head + filler + tail
+    return body.encode()
+
+
+def make_app(config):
+    """aiohttp web.Application untuk /page/<n>.html dan /asset/<n>.<ext> sesuai config."""
+    pages = {index: page_html(index, config) for index in range(config.pages)}
+    asset_body = bytes(config.asset_size)
+    content_types = {ext: content_type for ext, content_type, _ in ASSET_TYPES}
+
+    async def pause():
+        delay = config.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def page(request):
+        try:
+            body = pages[int(request.match_info['index'])]
+        except (KeyError, ValueError):
+            raise web.HTTPNotFound()
+        await pause()
+        return web.Response(body=body, content_type='text/html',
+                            headers={'ETag': f'"p{request.match_info["index"]}-{len(body)}"'})
+
+    async def asset(request):
+        content_type = content_types.get(request.match_info['ext'])
+        if content_type is None:
+            raise web.HTTPNotFound()
+        await pause()
+        return web.Response(body=asset_body, content_type=content_type)
+
+    app = web.Application()
+    app.add_routes([web.get(r'/page/{index}.html', page), web.get(r'/asset/{name}.{ext}', asset)])
+    return app
+
+
+def page_urls(base_url, config):
+    return [f"{base_url.rstrip('/')}/page/{index}.html" for index in range(config.pages)]
+
+
+def write_url_csv(path, urls):
+    """Tulis daftar URL dalam format url_bineca_http.csv (kolom index tanpa nama dan URL)."""
+    with open(path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['', 'URL'])
+        writer.writerows(enumerate(urls))
+
+
+async def serve(config, host='127.0.0.1', port=8080, https_port=None, cert_file=CERT_FILE, key_file=KEY_FILE):
+    """Jalankan origin HTTP (dan HTTPS kalau https_port diberikan) sampai task dibatalkan."""
+    runner = web.AppRunner(make_app(config), access_log=None)
+    await runner.setup()
+    sites = [web.TCPSite(runner, host, port, backlog=4096)]
+    if https_port is not None:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert_file, key_file)
+        sites.append(web.TCPSite(runner, host, https_port, ssl_context=context, backlog=4096))
+    for site in sites:
+        await site.start()
+    print(f"Origin serving {config.pages} pages x {config.assets} assets on http://{host}:{port}"
+          + (f" and https://{host}:{https_port}" if https_port is not None else ""), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local synthetic origin for offline runs and benchmarks of the traffic generators.')
+    parser.add_argument('-host', default='127.0.0.1', help='Listen address')
+    parser.add_argument('-port', type=int, default=8080, help='HTTP port')
+    parser.add_argument('-https-port', type=int, default=None, help='Also serve HTTPS on this port')
+    parser.add_argument('-cert', default=CERT_FILE, help='Certificate (PEM) for HTTPS')
+    parser.add_argument('-key', default=KEY_FILE, help='Private key (PEM) for HTTPS')
+    parser.add_argument('-pages', type=int, default=100, help='Number of pages')
+    parser.add_argument('-page-size', type=int, default=20000, help='HTML size in bytes')
+    parser.add_argument('-assets', type=int, default=10, help='Sub-resources per page')
+    parser.add_argument('-asset-size', type=int, default=50000, help='Size of each sub-resource in bytes')
+    parser.add_argument('-delay', type=float, default=0.0, help='Fixed latency added to every response (ms)')
+    parser.add_argument('-jitter', type=float, default=0.0, help='Mean of extra exponential latency per response (ms)')
+    parser.add_argument('-seed', type=int, default=None, help='Random seed for the injected jitter')
+    parser.add_argument('-write-urls', default=None, metavar='CSV', help='Write the HTTP page URLs in url_bineca_http.csv format and exit')
+    parser.add_argument('-write-https-urls', default=None, metavar='CSV', help='Write the HTTPS page URLs (needs -https-port) and exit')
+    args = parser.parse_args()
+
+    config = OriginConfig(args.pages, args.page_size, args.assets, args.asset_size, args.delay, args.jitter, args.seed)
+    if args.write_urls or args.write_https_urls:
+        if args.write_urls:
+            write_url_csv(args.write_urls, page_urls(f"http://{args.host}:{args.port}", config))
+        if args.write_https_urls and args.https_port is not None:
+            write_url_csv(args.write_https_urls, page_urls(f"https://{args.host}:{args.https_port}", config))
+        return
+    try:
+        asyncio.run(serve(config, args.host, args.port, args.https_port, args.cert, args.key))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import ssl
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from trafgen_timing import TIMED_POOL_CLASSES
+
+CONNECTION_MODES = ('persistent', 'fresh')
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    # Tiket TLS 1.3 baru datang setelah handshake, jadi sesi diambil lagi
+    # tepat sebelum socket ditutup.
+    def _real_close(self):
+        if self._sslobj is not None and getattr(self, '_tls_key', None) is not None:
+            session = self.session
+            if session is not None and session.has_ticket:
+                self.context.tls_sessions[self._tls_key] = session
+        super()._real_close()
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """SSLContext yang menyimpan sesi TLS per (host, port) supaya handshake berikutnya bisa resume.
+
+    urllib3 tidak meneruskan sesi lama ke wrap_socket, jadi sesi terakhir
+    disimpan di sini dan dipasang otomatis saat koneksi baru dibuat.
+    """
+
+    sslsocket_class = _ResumingSSLSocket
+
+    def __new__(cls, verify=True):
+        context = super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+        context.tls_sessions = {}
+        if verify:
+            context.load_default_certs()
+        else:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        return context
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        key = (server_hostname, sock.getpeername()[1])
+        if session is None:
+            session = self.tls_sessions.get(key)
+        ssock = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+        ssock._tls_key = key
+        if ssock.session is not None and ssock.session.has_ticket:
+            self.tls_sessions[key] = ssock.session
+        return ssock
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter dengan ukuran pool per host, IP sumber dan SSLContext sendiri (semua opsional).
+
+    Koneksinya memakai kelas dari trafgen_timing supaya DNS, connect dan TLS
+    bisa diukur per request.
+    """
+
+    def __init__(self, source_address=None, ssl_context=None, **kwargs):
+        self.source_address = source_address
+        self.ssl_context = ssl_context
+        super(PooledAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.source_address is not None:
+            kwargs['source_address'] = (self.source_address, 0)
+        if self.ssl_context is not None:
+            kwargs['ssl_context'] = self.ssl_context
+        super(PooledAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+
+class SessionPool:
+    """Sumber requests.Session untuk satu halaman.
+
+    mode 'persistent' : satu Session bersama, koneksi keep-alive dipakai ulang
+                        antar halaman dan sesi TLS di-resume
+    mode 'fresh'      : Session baru per halaman (meniru user dingin: TCP dan
+                        TLS handshake penuh tiap halaman), ditutup setelahnya
+
+    pool_connections adalah jumlah host yang pool-nya disimpan, pool_maxsize
+    jumlah koneksi idle yang disimpan per host.
+    """
+
+    def __init__(self, mode='persistent', pool_connections=100, pool_maxsize=100, verify=True, source_address=None):
+        if mode not in CONNECTION_MODES:
+            raise ValueError(f"Mode koneksi tidak dikenal: {mode}")
+        self.mode = mode
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.verify = verify
+        self.source_address = source_address
+        self.ssl_context = ResumingSSLContext(verify) if mode == 'persistent' else None
+        self._shared = self.new_session() if mode == 'persistent' else None
+
+    def new_session(self):
+        session = requests.Session()
+        session.verify = self.verify
+        adapter = PooledAdapter(self.source_address, self.ssl_context,
+                                pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @contextmanager
+    def page(self):
+        if self._shared is not None:
+            yield self._shared
+            return
+        session = self.new_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def close(self):
+        if self._shared is not None:
+            self._shared.close()
@@ -0,0 +1,189 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from trafgen_sched import ArrivalScheduler
+
+PROFILE_MODES = ('constant', 'poisson')
+
+
+class RateProfile:
+    """Rate (req/s) yang berubah terhadap waktu, linear di antara titik-titiknya.
+
+    times adalah detik sejak awal profil (naik), rates rate di titik itu.
+    speedup memampatkan sumbu waktu saja: forecast 24 jam dengan speedup=60
+    diputar dalam 24 menit dengan bentuk kurva yang sama, rate di tiap titik
+    tetap seperti di data (dikali scale).
+    """
+
+    def __init__(self, times, rates, speedup=1.0, scale=1.0):
+        times = np.asarray(times, dtype=float)
+        rates = np.asarray(rates, dtype=float) * scale
+        if len(times) < 2 or len(times) != len(rates):
+            raise ValueError("Profil rate butuh minimal dua titik (waktu, rate)")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("Waktu profil rate harus naik")
+        if np.any(rates < 0) or not np.all(np.isfinite(rates)):
+            raise ValueError("Rate di profil harus >= 0")
+        if speedup <= 0:
+            raise ValueError(f"Speedup harus > 0, bukan {speedup}")
+        self.speedup = speedup
+        self.times = (times - times[0]) / speedup
+        self.rates = rates
+        # Jumlah request kumulatif (integral rate) di tiap titik
+        steps = np.diff(self.times)
+        self.cumulative = np.concatenate(([0.0], np.cumsum(steps * (rates[:-1] + rates[1:]) / 2)))
+        if self.cumulative[-1] <= 0:
+            raise ValueError("Profil rate tidak menghasilkan request (semua rate 0)")
+
+    @classmethod
+    def from_series(cls, timestamps, rates, speedup=1.0, scale=1.0):
+        """Profil dari deret waktu (datetime atau detik) dan rate, misalnya hasil forecast per jam.
+
+        Tiap titik dianggap rate untuk satu langkah, jadi titik terakhir
+        dipertahankan satu langkah lagi: 24 titik per jam menjadi profil 24 jam.
+        """
+        timestamps = pd.Series(timestamps)
+        if pd.api.types.is_numeric_dtype(timestamps):
+            seconds = timestamps.to_numpy(dtype=float)
+        else:
+            timestamps = pd.to_datetime(timestamps)
+            seconds = (timestamps - timestamps.iloc[0]).dt.total_seconds().to_numpy()
+        rates = np.asarray(rates, dtype=float)
+        if len(seconds) > 1:
+            seconds = np.append(seconds, seconds[-1] + np.median(np.diff(seconds)))
+            rates = np.append(rates, rates[-1])
+        return cls(seconds, rates, speedup, scale)
+
+    @classmethod
+    def from_csv(cls, path, time_column='timestamp', rate_column='rate', speedup=1.0, scale=1.0):
+        """Profil dari CSV berkolom time_column (datetime atau detik) dan rate_column (req/s)."""
+        df = pd.read_csv(path, usecols=[time_column, rate_column])
+        return cls.from_series(df[time_column], df[rate_column], speedup, scale)
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    @property
+    def expected_requests(self):
+        return self.cumulative[-1]
+
+    @property
+    def mean_rate(self):
+        return self.expected_requests / self.duration
+
+    def scaled(self, factor):
+        """Profil yang sama dengan rate dikali factor, misalnya bagian satu worker dari -workers."""
+        return RateProfile(self.times * self.speedup, self.rates, self.speedup, factor)
+
+    def rate_at(self, t):
+        return np.interp(t, self.times, self.rates)
+
+    def offset_of(self, counts):
+        """Waktu (detik) saat jumlah request kumulatif mencapai counts (array), kebalikan dari integral rate."""
+        counts = np.asarray(counts, dtype=float)
+        segment = np.clip(np.searchsorted(self.cumulative, counts, side='right') - 1, 0, len(self.times) - 2)
+        start, rate = self.times[segment], self.rates[segment]
+        slope = (self.rates[segment + 1] - rate) / (self.times[segment + 1] - start)
+        remaining = counts - self.cumulative[segment]
+        # Akar rate*tau + slope*tau^2/2 = remaining dalam bentuk yang stabil
+        # juga saat slope ~ 0 atau rate = 0
+        denominator = rate + np.sqrt(np.maximum(rate * rate + 2 * slope * remaining, 0))
+        tau = np.divide(2 * remaining, denominator, out=np.zeros_like(remaining), where=denominator > 0)
+        return np.minimum(start + tau, self.duration)
+
+    def count_at(self, t):
+        """Jumlah request kumulatif (integral rate) sampai t detik, kebalikan dari offset_of."""
+        t = min(max(t, 0.0), self.duration)
+        segment = min(int(np.searchsorted(self.times, t, side='right')) - 1, len(self.times) - 2)
+        start, rate = self.times[segment], self.rates[segment]
+        slope = (self.rates[segment + 1] - rate) / (self.times[segment + 1] - start)
+        tau = t - start
+        return float(self.cumulative[segment] + rate * tau + slope * tau * tau / 2)
+
+    def describe(self):
+        return (f"Rate profile: {self.duration:.1f} s (speedup {self.speedup:g}x), "
+                f"{self.rates.min():.2f}-{self.rates.max():.2f} req/s, mean {self.mean_rate:.2f} req/s, "
+                f"~{self.expected_requests:.0f} requests")
+
+
+class ProfileScheduler(ArrivalScheduler):
+    """ArrivalScheduler yang mengikuti RateProfile, bukan rate konstan.
+
+    Offset dihitung dengan membalik integral rate profil (time rescaling):
+    mode 'constant' mengirim request ke-k saat integralnya mencapai k, mode
+    'poisson' memakai jarak eksponensial di skala integral itu sehingga
+    hasilnya proses Poisson tak homogen dengan rate sesuai profil. Offset
+    berhenti di akhir profil walau n belum tercapai.
+
+    refresh (opsional) dipanggil tiap refresh_interval detik run dan saat
+    profil habis; kalau ia mengembalikan RateProfile baru (misalnya forecast
+    dengan baris data baru), offset berikutnya diteruskan dari waktu offset
+    terakhir di profil baru itu (lihat count_at). None berarti tidak ada
+    perubahan.
+    """
+
+    def __init__(self, profile, mode='constant', seed=None, batch_size=65536, refresh=None,
+                 refresh_interval=60.0):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode arrival untuk profil rate harus salah satu dari {PROFILE_MODES}, bukan {mode}")
+        if refresh is not None and refresh_interval <= 0:
+            raise ValueError(f"Interval refresh profil harus > 0, bukan {refresh_interval}")
+        super().__init__(profile.mean_rate, mode, seed=seed, batch_size=batch_size)
+        self.profile = profile
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.refreshes = 0
+
+    def _refresh(self):
+        """Ganti profil dengan hasil refresh(); True kalau profilnya berganti."""
+        if self.refresh is None:
+            return False
+        profile = self.refresh()
+        if profile is None:
+            return False
+        self.profile = profile
+        self.rate = profile.mean_rate
+        self.refreshes += 1
+        return True
+
+    def offsets(self, n):
+        done = 0
+        # Posisi di integral rate dan offset request terakhir yang dikirim
+        count = None
+        last = 0.0
+        next_refresh = self.refresh_interval if self.refresh is not None else math.inf
+        while done < n:
+            k = min(self.batch_size, n - done)
+            if self.mode == 'poisson':
+                counts = np.cumsum(self.rng.exponential(1.0, k))
+                counts += count if count is not None else -counts[0]
+            else:
+                counts = (0.0 if count is None else count + 1) + np.arange(k, dtype=float)
+            counts = counts[counts < self.profile.expected_requests]
+            offsets = self.profile.offset_of(counts)
+            # Batch dipotong di waktu refresh berikutnya; sisanya dibangkitkan
+            # ulang dari profil yang berlaku setelah refresh
+            cut = int(np.searchsorted(offsets, next_refresh))
+            yield from offsets[:cut].tolist()
+            done += cut
+            if cut:
+                count, last = counts[cut - 1], offsets[cut - 1]
+            if cut < len(counts):
+                if self._refresh() and count is not None:
+                    count = self.profile.count_at(last)
+                next_refresh = offsets[cut] + self.refresh_interval
+            elif len(counts) < k:
+                # Profil habis: lanjut hanya kalau refresh memberi profil baru
+                if not self._refresh():
+                    return
+                if count is not None:
+                    count = self.profile.count_at(last)
+
+    def report(self, completed):
+        print(self.profile.describe())
+        if self.refresh is not None:
+            print(f"Rate profile refreshed {self.refreshes} times during the run")
+        return super().report(completed)
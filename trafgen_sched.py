@@ -0,0 +1,112 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+ARRIVAL_MODES = ('constant', 'poisson', 'onoff')
+
+# Kolom jadwal per request, ditulis setelah kolom fase di log. RTT tetap
+# dihitung dari waktu mulai sebenarnya (service time); Corrected Latency
+# dihitung dari waktu kirim yang dijadwalkan, jadi waktu antri di executor
+# atau semaphore ikut terhitung (koreksi coordinated omission).
+SCHEDULE_COLUMNS = ['Intended Start', 'Queue Delay (ms)', 'Corrected Latency (ms)']
+
+
+def schedule_columns(intended, start_time, rtt):
+    """Nilai SCHEDULE_COLUMNS untuk request yang dijadwalkan pada intended dan mulai pada start_time."""
+    queue_delay = max((start_time - intended).total_seconds() * 1000, 0)
+    return [intended, queue_delay, queue_delay + rtt]
+
+
+class ArrivalScheduler:
+    """Penjadwal kedatangan open-loop berbasis deadline absolut.
+
+    Setiap request punya offset kirim (detik sejak start) yang dihitung di
+    depan, jadi waktu untuk sampling URL dan submit tidak menumpuk jadi
+    drift seperti time.sleep(1 / rps).
+
+    mode 'constant' : jarak antar request tetap 1/rate
+    mode 'poisson'  : jarak antar request eksponensial dengan rata-rata 1/rate
+    mode 'onoff'    : burst selama on detik lalu diam off detik, rata-rata tetap rate
+    """
+
+    def __init__(self, rate, mode='constant', burst=(1.0, 1.0), seed=None, batch_size=65536):
+        if rate <= 0:
+            raise ValueError(f"Rate harus > 0, bukan {rate}")
+        if mode not in ARRIVAL_MODES:
+            raise ValueError(f"Mode arrival tidak dikenal: {mode}")
+        self.rate = rate
+        self.mode = mode
+        self.on, self.off = burst
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.t0 = None
+        self.wall0 = None
+        self.sent = 0
+        self.last_send = None
+        self.max_lag = 0.0
+
+    def offsets(self, n):
+        """Offset kirim (detik) untuk n request, dibangkitkan per batch."""
+        done = 0
+        elapsed = 0.0
+        while done < n:
+            k = min(self.batch_size, n - done)
+            if self.mode == 'poisson':
+                batch = elapsed + np.cumsum(self.rng.exponential(1 / self.rate, k))
+                if done == 0:
+                    batch -= batch[0]
+                elapsed = batch[-1]
+            elif self.mode == 'onoff':
+                on_rate = self.rate * (self.on + self.off) / self.on
+                on_time = (done + np.arange(k)) / on_rate
+                cycle = np.floor(on_time / self.on)
+                batch = cycle * (self.on + self.off) + (on_time - cycle * self.on)
+            else:
+                batch = (done + np.arange(k)) / self.rate
+            yield from batch.tolist()
+            done += k
+
+    def start(self):
+        self.t0 = time.perf_counter()
+        self.wall0 = datetime.now()
+
+    def intended(self, offset):
+        """Waktu kirim yang dijadwalkan (datetime) untuk offset, walau request baru jalan belakangan."""
+        if self.wall0 is None:
+            self.start()
+        return self.wall0 + timedelta(seconds=offset)
+
+    def _delay(self, offset):
+        if self.t0 is None:
+            self.start()
+        delay = self.t0 + offset - time.perf_counter()
+        if delay < 0:
+            self.max_lag = max(self.max_lag, -delay)
+        return delay
+
+    def _sent(self):
+        self.sent += 1
+        self.last_send = time.perf_counter()
+
+    def wait(self, offset):
+        delay = self._delay(offset)
+        if delay > 0:
+            time.sleep(delay)
+        self._sent()
+
+    async def wait_async(self, offset):
+        await asyncio.sleep(max(self._delay(offset), 0))
+        self._sent()
+
+    def report(self, completed):
+        end = time.perf_counter()
+        send_span = (self.last_send - self.t0) if self.sent > 1 else 0
+        sent_rate = (self.sent - 1) / send_span if send_span > 0 else 0
+        completed_rate = completed / (end - self.t0) if self.t0 is not None and end > self.t0 else 0
+
+        print(f"Offered rate: {self.rate:.2f} req/s ({self.mode}), Achieved send rate: {sent_rate:.2f} req/s, "
+              f"Completed rate: {completed_rate:.2f} req/s, Max dispatch lag: {self.max_lag * 1000:.2f} ms")
+        return {'offered_rps': self.rate, 'sent_rps': sent_rate, 'completed_rps': completed_rate,
+                'max_lag_ms': self.max_lag * 1000}
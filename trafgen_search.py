@@ -0,0 +1,192 @@
+import argparse
+import csv
+import time
+
+import pandas as pd
+
+from trafgen_async import generate_traffic_async
+from trafgen_fetch import CHUNK_SIZE, MAX_PER_HOST
+from trafgen_hist import REPORT_PERCENTILES
+from trafgen_links import extract_links
+from trafgen_manifest import ManifestCache
+from trafgen_pool import CONNECTION_MODES
+from trafgen_sched import ArrivalScheduler, ARRIVAL_MODES
+from trafgen_zipf import ZipfSampler
+
+SEARCH_MODES = ('step', 'bisect')
+CURVE_COLUMNS = (['offered_rps', 'sent_rps', 'achieved_rps', 'requests', 'error_rate']
+                 + [f"p{p:g}_ms" for p in REPORT_PERCENTILES] + ['max_ms', 'service_p99_ms', 'verdict'])
+
+
+class SLO:
+    """Batas yang menentukan apakah satu langkah rate masih lolos.
+
+    p99_ms berlaku untuk corrected latency (dari intended start, lihat
+    trafgen_sched), jadi antrian di generator saat target jenuh ikut
+    terhitung. min_achieved adalah rasio minimal achieved/offered rate.
+    """
+
+    def __init__(self, p99_ms=1000.0, max_error_rate=0.01, min_achieved=0.95):
+        self.p99_ms = p99_ms
+        self.max_error_rate = max_error_rate
+        self.min_achieved = min_achieved
+
+    def breaches(self, point):
+        """Daftar alasan point (baris kurva) melanggar SLO; kosong kalau lolos."""
+        reasons = []
+        if point['p99_ms'] > self.p99_ms:
+            reasons.append(f"p99 {point['p99_ms']:.1f} ms > {self.p99_ms:g} ms")
+        if point['error_rate'] > self.max_error_rate:
+            reasons.append(f"errors {point['error_rate'] * 100:.2f}% > {self.max_error_rate * 100:g}%")
+        if point['achieved_rps'] < self.min_achieved * point['offered_rps']:
+            reasons.append(f"achieved {point['achieved_rps']:.1f} < {self.min_achieved:g} x offered")
+        return reasons
+
+
+def measure(rate, duration, urls, args, seed=None):
+    """Jalankan satu langkah open-loop pada rate selama duration detik dan kembalikan baris kurvanya."""
+    sampler = ZipfSampler(urls, *args.zipf, seed=seed)
+    scheduler = ArrivalScheduler(rate, args.arrival, seed=seed)
+    manifest = ManifestCache(args.manifest, args.manifest_ttl)
+    num_requests = max(int(rate * duration), 1)
+    stats = generate_traffic_async(sampler, num_requests, scheduler, extract_links, lambda row: None,
+                                   max_in_flight=args.inflight, per_host=args.perhost, conn_mode=args.conn,
+                                   ssl=not args.insecure, manifest=manifest, chunk_size=args.chunk, verbose=False)
+    elapsed = time.perf_counter() - scheduler.t0
+    send_span = scheduler.last_send - scheduler.t0 if scheduler.sent > 1 else 0
+    point = {
+        'offered_rps': rate,
+        'sent_rps': (scheduler.sent - 1) / send_span if send_span > 0 else 0.0,
+        'achieved_rps': (stats.count - stats.errors) / elapsed if elapsed > 0 else 0.0,
+        'requests': stats.count,
+        'error_rate': stats.errors / stats.count if stats.count else 1.0,
+    }
+    for p in REPORT_PERCENTILES:
+        point[f"p{p:g}_ms"] = stats.corrected.percentile(p)
+    point['max_ms'] = stats.corrected.max
+    point['service_p99_ms'] = stats.latency.percentile(99)
+    return point
+
+
+def check_ramp(start, factor=2.0, increment=None, tolerance=0.05):
+    """Raise ValueError kalau ramp search() tidak akan pernah naik (dan loop-nya tidak berhenti)."""
+    if start <= 0:
+        raise ValueError(f"Rate awal harus > 0, bukan {start:g}")
+    if increment is not None and increment <= 0:
+        raise ValueError(f"Increment harus > 0, bukan {increment:g}")
+    if increment is None and factor <= 1:
+        raise ValueError(f"Factor harus > 1 kalau increment tidak diberikan, bukan {factor:g}")
+    if tolerance <= 0:
+        raise ValueError(f"Tolerance harus > 0, bukan {tolerance:g}")
+
+
+def search(run_step, slo, start, max_rate, mode='step', factor=2.0, increment=None, tolerance=0.05, pause=0.0):
+    """Cari rate tertinggi yang masih memenuhi slo; mengembalikan (kurva, rate lolos tertinggi atau None).
+
+    run_step(rate) menjalankan satu langkah dan mengembalikan baris kurva.
+    Mode 'step' menaikkan rate (dikali factor, atau ditambah increment
+    kalau diberikan) sampai SLO dilanggar atau max_rate tercapai. Mode
+    'bisect' melakukan hal yang sama untuk mencari rentang lolos/gagal, lalu
+    membagi dua rentang itu sampai lebarnya di bawah tolerance (relatif).
+    Di antara langkah ada jeda pause detik supaya antrian di target habis.
+    Argumen ramp yang tidak naik ditolak dengan ValueError (check_ramp).
+    """
+    check_ramp(start, factor, increment, tolerance)
+    curve = []
+
+    def step(rate):
+        if curve and pause > 0:
+            time.sleep(pause)
+        point = run_step(rate)
+        reasons = slo.breaches(point)
+        point['verdict'] = '; '.join(reasons) if reasons else 'ok'
+        curve.append(point)
+        print(f"Step {len(curve)}: offered {rate:.2f} req/s, achieved {point['achieved_rps']:.2f} req/s, "
+              f"p99 {point['p99_ms']:.2f} ms, errors {point['error_rate'] * 100:.2f}% -> {point['verdict']}")
+        return not reasons
+
+    good, bad = None, None
+    rate = start
+    while rate <= max_rate:
+        if step(rate):
+            good = rate
+        else:
+            bad = rate
+            break
+        rate = rate + increment if increment is not None else rate * factor
+
+    # Kalau rate pertama pun sudah gagal tidak ada batas bawah untuk
+    # dibagi dua; -start perlu diturunkan
+    if mode == 'bisect' and good is not None and bad is not None:
+        while bad - good > tolerance * good:
+            rate = (good + bad) / 2
+            if step(rate):
+                good = rate
+            else:
+                bad = rate
+    return curve, good
+
+
+def write_curve(curve, path):
+    curve = sorted(curve, key=lambda point: point['offered_rps'])
+    with open(path, mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CURVE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(curve)
+
+
+def print_curve(curve):
+    latency = "".join(f"{'p' + format(p, 'g'):>10}" for p in REPORT_PERCENTILES)
+    print(f"{'offered':>10}{'sent':>10}{'achieved':>10}{'err %':>8}{latency}  verdict")
+    for point in sorted(curve, key=lambda point: point['offered_rps']):
+        values = "".join(f"{point[f'p{p:g}_ms']:>10.2f}" for p in REPORT_PERCENTILES)
+        print(f"{point['offered_rps']:>10.2f}{point['sent_rps']:>10.2f}{point['achieved_rps']:>10.2f}"
+              f"{point['error_rate'] * 100:>8.2f}{values}  {point['verdict']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find the highest request rate that meets a latency/error SLO (rate-vs-latency curve).')
+    parser.add_argument('-urls', default='url_bineca_http.csv', help='CSV file with a URL column')
+    parser.add_argument('-zipf', type=float, nargs=2, default=[1.0, 1.0], help='Zipf parameters: q and s')
+    parser.add_argument('-mode', choices=SEARCH_MODES, default='bisect', help='step: ramp until the SLO breaks, bisect: ramp then binary-search the knee')
+    parser.add_argument('-start', type=float, default=10.0, help='First offered rate (req/s)')
+    parser.add_argument('-max', type=float, default=100000.0, help='Highest offered rate tried (req/s)')
+    parser.add_argument('-factor', type=float, default=2.0, help='Rate multiplier between ramp steps')
+    parser.add_argument('-increment', type=float, default=None, help='Add this many req/s per ramp step instead of multiplying by -factor')
+    parser.add_argument('-tolerance', type=float, default=0.05, help='Stop bisecting when the pass/fail bracket is narrower than this fraction')
+    parser.add_argument('-duration', type=float, default=10.0, help='Seconds per step')
+    parser.add_argument('-pause', type=float, default=2.0, help='Idle seconds between steps so the target can drain')
+    parser.add_argument('-slo-p99', type=float, default=1000.0, help='Max p99 corrected latency in ms')
+    parser.add_argument('-slo-errors', type=float, default=0.01, help='Max error rate (fraction)')
+    parser.add_argument('-slo-achieved', type=float, default=0.95, help='Min achieved/offered rate ratio')
+    parser.add_argument('-arrival', choices=ARRIVAL_MODES, default='constant', help='Arrival process for each step (poisson needs long steps for a stable achieved/offered ratio)')
+    parser.add_argument('-inflight', type=int, default=10000, help='Max in-flight requests')
+    parser.add_argument('-perhost', type=int, default=MAX_PER_HOST, help='Max parallel sub-resource fetches per host for each page')
+    parser.add_argument('-manifest', type=int, default=1024, help='Pages whose sub-resource list is cached (LRU, keyed by URL + ETag/content hash; 0 disables)')
+    parser.add_argument('-manifest-ttl', type=float, default=300.0, help='Seconds a cached sub-resource list stays valid')
+    parser.add_argument('-chunk', type=int, default=CHUNK_SIZE, help='Read size in bytes for bodies that are counted without buffering')
+    parser.add_argument('-conn', choices=CONNECTION_MODES, default='persistent', help='persistent: keep-alive pool shared by all pages, fresh: new connections for every page (cold users)')
+    parser.add_argument('-insecure', action='store_true', help='Do not verify TLS certificates')
+    parser.add_argument('-seed', type=int, default=None, help='Random seed for a reproducible URL/arrival stream')
+    parser.add_argument('-out', default='search_curve.csv', help='CSV file for the rate-vs-latency curve')
+    args = parser.parse_args()
+    try:
+        check_ramp(args.start, args.factor, args.increment, args.tolerance)
+    except ValueError as e:
+        parser.error(str(e))
+
+    urls = pd.read_csv(args.urls)['URL'].tolist()
+    slo = SLO(args.slo_p99, args.slo_errors, args.slo_achieved)
+
+    curve, best = search(lambda rate: measure(rate, args.duration, urls, args, args.seed), slo,
+                         args.start, args.max, args.mode, args.factor, args.increment, args.tolerance, args.pause)
+    write_curve(curve, args.out)
+    print_curve(curve)
+    if best is None:
+        print(f"No rate met the SLO (lowest tried: {args.start:g} req/s)")
+    else:
+        print(f"Highest rate meeting the SLO: {best:.2f} req/s (curve written to {args.out})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import ipaddress
+import threading
+from itertools import cycle
+
+from trafgen_pool import SessionPool
+from trafgen_zipf import WeightedSampler, ZipfSampler
+
+SOURCE_POLICIES = ('rr', 'weighted', 'zipf')
+
+
+def resolve_source(spec):
+    """IP dipakai apa adanya, selain itu dianggap nama interface (misal uesimtun0)."""
+    try:
+        return str(ipaddress.ip_address(spec))
+    except ValueError:
+        # tgp ikut mengimpor psutil, jadi hanya diimpor kalau perlu
+        from tgp import get_ip_from_interface
+        return get_ip_from_interface(spec)
+
+
+def resolve_sources(specs):
+    return [resolve_source(spec) for spec in specs]
+
+
+class SourcePool:
+    """Sekumpulan IP sumber (satu per UE) dengan SessionPool (trafgen_pool) masing-masing.
+
+    policy 'rr'       : bergiliran
+    policy 'weighted' : acak sesuai weights
+    policy 'zipf'     : acak dengan Zipf-Mandelbrot (q, s) atas urutan UE
+    """
+
+    def __init__(self, sources, policy='rr', weights=None, zipf=(1.0, 1.0), seed=None,
+                 conn_mode='persistent', pool_maxsize=100, verify=True):
+        if not sources:
+            raise ValueError("Minimal satu IP sumber diperlukan")
+        if policy not in SOURCE_POLICIES:
+            raise ValueError(f"Policy sumber tidak dikenal: {policy}")
+        self.sources = list(sources)
+        self.conn_mode = conn_mode
+        self.pool_maxsize = pool_maxsize
+        self.verify = verify
+        self._pools = {}
+        self._lock = threading.Lock()
+
+        if policy == 'weighted':
+            if weights is None or len(weights) != len(self.sources):
+                raise ValueError("Policy weighted butuh satu bobot per IP sumber")
+            self._picker = WeightedSampler(self.sources, weights, seed)
+        elif policy == 'zipf':
+            self._picker = ZipfSampler(self.sources, *zipf, seed=seed)
+        else:
+            self._picker = cycle(self.sources)
+
+    def pick(self):
+        return next(self._picker)
+
+    def pool(self, source_ip):
+        pool = self._pools.get(source_ip)
+        if pool is None:
+            # Dipanggil dari banyak thread make_request; tanpa lock dua thread
+            # bisa membuat pool untuk sumber yang sama dan satu tidak pernah ditutup
+            with self._lock:
+                pool = self._pools.get(source_ip)
+                if pool is None:
+                    pool = self._pools[source_ip] = SessionPool(self.conn_mode, pool_maxsize=self.pool_maxsize,
+                                                                verify=self.verify, source_address=source_ip)
+        return pool
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.close()
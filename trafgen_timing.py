@@ -0,0 +1,101 @@
+import socket
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+# Kolom fase per request, ditulis setelah Throughput di log. Semua dalam ms
+# dan hanya untuk dokumen utama; koneksi keep-alive yang dipakai ulang
+# tercatat 0 untuk DNS/Connect/TLS.
+PHASE_COLUMNS = ['TTFB (ms)', 'DNS (ms)', 'Connect (ms)', 'TLS (ms)', 'Transfer (ms)']
+EMPTY_PHASES = [''] * len(PHASE_COLUMNS)
+
+_local = threading.local()
+
+
+class PhaseTimer:
+    __slots__ = ('dns', 'connect', 'tls')
+
+    def __init__(self):
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+
+
+def start_timer():
+    """Mulai timer fase baru untuk thread ini; koneksi yang dibuat sesudahnya dicatat ke sini."""
+    _local.timer = PhaseTimer()
+    return _local.timer
+
+
+def _current_timer():
+    return getattr(_local, 'timer', None)
+
+
+class _TimedConnectionMixin:
+    # DNS di-resolve sendiri supaya bisa dipisah dari TCP connect; alamat
+    # hasil resolve lalu dicoba satu per satu seperti create_connection.
+    def _new_conn(self):
+        timer = _current_timer()
+        if timer is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        dns_start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror:
+            return super()._new_conn()
+        connect_start = time.perf_counter()
+        timer.dns += (connect_start - dns_start) * 1000
+
+        try:
+            for index, info in enumerate(infos):
+                self._dns_host = info[4][0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except Exception:
+                    if index == len(infos) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+            self._connect_ms = (time.perf_counter() - connect_start) * 1000
+            timer.connect += self._connect_ms
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        timer = _current_timer()
+        if timer is None:
+            return super().connect()
+
+        dns_before = timer.dns
+        self._connect_ms = 0.0
+        start = time.perf_counter()
+        super().connect()
+        total = (time.perf_counter() - start) * 1000
+        timer.tls += max(total - (timer.dns - dns_before) - self._connect_ms, 0.0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+TIMED_POOL_CLASSES = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+
+def print_phase_summary(averages):
+    print("Average phases: " + ", ".join(f"{name.replace(' (ms)', '')}: {value:.2f} ms"
+                                         for name, value in zip(PHASE_COLUMNS, averages)))
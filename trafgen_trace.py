@@ -0,0 +1,116 @@
+import heapq
+import os
+from collections import deque
+
+import pandas as pd
+
+from trafgen_sched import ArrivalScheduler
+
+# Kolom waktu yang dicoba berurutan: Intended Start adalah jadwal asli
+# (tanpa antrian di generator), Start Time untuk log lama
+TIME_COLUMNS = ('Intended Start', 'Start Time')
+
+
+def _sep(path):
+    with open(path, newline='') as file:
+        header = file.readline()
+    return '\t' if '\t' in header else ','
+
+
+def read_trace(path, time_column=None, url_column='URL', reorder_window=60.0, chunksize=100_000):
+    """Stream (detik sejak request pertama, url) dari log request atau trace CSV/TSV, urut waktu.
+
+    File dibaca per chunk, jadi trace sebesar apa pun tidak dimuat sekaligus.
+    Log ditulis urut selesai, bukan urut mulai, jadi baris disusun ulang di
+    heap selebar reorder_window detik (harus lebih besar dari RTT terlama di
+    trace). Baris tanpa waktu yang valid (Total/Average/P50... di akhir log
+    atau baris rusak) dilewati. Waktu boleh ISO 8601 atau detik epoch.
+    """
+    sep = _sep(path)
+    header = pd.read_csv(path, sep=sep, nrows=0).columns
+    if time_column is None:
+        time_column = next((column for column in TIME_COLUMNS if column in header), None)
+        if time_column is None:
+            raise ValueError(f"{path} tidak punya kolom waktu {TIME_COLUMNS}")
+    reader = pd.read_csv(path, sep=sep, usecols=[url_column, time_column], dtype={url_column: str},
+                         chunksize=chunksize, on_bad_lines='skip')
+
+    pending = []
+    sequence = 0
+    first = None
+    latest = None
+    for chunk in reader:
+        times = chunk[time_column]
+        if pd.api.types.is_numeric_dtype(times):
+            seconds = times.astype(float)
+        else:
+            seconds = pd.to_datetime(times, format='ISO8601', errors='coerce')
+            seconds = (seconds - pd.Timestamp(0)).dt.total_seconds()
+        chunk = pd.DataFrame({'url': chunk[url_column], 'seconds': seconds}).dropna()
+        for url, at in zip(chunk['url'].tolist(), chunk['seconds'].tolist()):
+            heapq.heappush(pending, (at, sequence, url))
+            sequence += 1
+            latest = at if latest is None else max(latest, at)
+        while pending and pending[0][0] <= latest - reorder_window:
+            at, _, url = heapq.heappop(pending)
+            if first is None:
+                first = at
+            yield at - first, url
+    while pending:
+        at, _, url = heapq.heappop(pending)
+        if first is None:
+            first = at
+        yield at - first, url
+
+
+class TraceScheduler(ArrivalScheduler):
+    """Penjadwal yang memutar ulang urutan URL dan jarak antar request dari trace.
+
+    Offset diambil dari read_trace lalu dibagi speed (2 = dua kali lebih
+    cepat). Objek ini juga menjadi sampler URL: tiap next() mengembalikan URL
+    untuk offset terakhir yang sudah dikeluarkan offsets(), sesuai urutan
+    pemakaian di generate_traffic. Dengan parts > 1 (beberapa worker), part
+    ke-i mengambil baris ke-i, ke-(i + parts), dst. dengan jadwal aslinya.
+    """
+
+    def __init__(self, path, speed=1.0, part=0, parts=1, time_column=None, url_column='URL',
+                 reorder_window=60.0):
+        if speed <= 0:
+            raise ValueError(f"Speed harus > 0, bukan {speed}")
+        # rate ArrivalScheduler baru diketahui setelah trace habis diputar
+        super().__init__(1.0)
+        self.mode = 'trace'
+        self.path = path
+        self.speed = speed
+        self.part = part
+        self.parts = parts
+        self.time_column = time_column
+        self.url_column = url_column
+        self.reorder_window = reorder_window
+        self.span = 0.0
+        self._urls = deque()
+
+    def offsets(self, n):
+        trace = read_trace(self.path, self.time_column, self.url_column, self.reorder_window)
+        done = 0
+        for index, (offset, url) in enumerate(trace):
+            if done >= n:
+                break
+            if index % self.parts != self.part:
+                continue
+            self._urls.append(url)
+            self.span = offset / self.speed
+            done += 1
+            yield self.span
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._urls.popleft()
+
+    def report(self, completed):
+        self.rate = self.sent / self.span if self.span > 0 else 0.0
+        print(f"Trace replay: {self.sent} requests from {os.path.basename(self.path)} at {self.speed:g}x, "
+              f"trace span {self.span * self.speed:.2f} s replayed in {self.span:.2f} s")
+        return super().report(completed)
@@ -0,0 +1,81 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+
+from trafgen_hist import RunStats
+
+# Baris di part ditulis menurut urutan masuk ke LogWriter, jadi End Time-nya
+# hanya hampir urut; baris ditahan selama jendela ini sebelum di-merge
+REORDER_WINDOW = 5.0
+
+
+def split_budget(num_requests, requests_per_second, num_workers, log_file, seed=None):
+    """Bagi total -req/-rps ke num_workers shard, masing-masing dengan seed dan log sendiri."""
+    shards = []
+    for index in range(num_workers):
+        shards.append({
+            'index': index,
+            'num_requests': num_requests // num_workers + (1 if index < num_requests % num_workers else 0),
+            'requests_per_second': requests_per_second / num_workers,
+            'seed': None if seed is None else seed + index,
+            'log_file': f"{log_file}.w{index}",
+        })
+    return shards
+
+
+def _end_time(line):
+    return datetime.fromisoformat(line.split('\t')[2])
+
+
+def _sorted_rows(file, window=REORDER_WINDOW):
+    """(End Time, nomor baris, baris) dari file, urut asalkan tidak ada baris yang terlambat lebih dari window detik."""
+    heap = []
+    window = timedelta(seconds=window)
+    for number, line in enumerate(file):
+        end_time = _end_time(line)
+        heapq.heappush(heap, (end_time, number, line))
+        while heap[0][0] <= end_time - window:
+            yield heapq.heappop(heap)
+    while heap:
+        yield heapq.heappop(heap)
+
+
+def merge_logs(part_files, log_file, window=REORDER_WINDOW):
+    """Gabungkan log per worker ke log_file, urut berdasarkan End Time, lalu hapus part-nya.
+
+    Tiap part diurutkan dengan jendela window detik (lihat _sorted_rows);
+    baris yang tertunda lebih lama dari itu, misalnya karena write() yang
+    lama tertahan backpressure, hanya masuk dalam urutan kira-kira.
+    """
+    files = [open(part, mode='r') for part in part_files if os.path.exists(part)]
+    try:
+        with open(log_file, mode='a') as out:
+            out.writelines(line for _, _, line in heapq.merge(*(_sorted_rows(file, window) for file in files)))
+    finally:
+        for file in files:
+            file.close()
+            os.remove(file.name)
+
+
+def run_workers(target, num_workers, num_requests, requests_per_second, log_file, seed=None):
+    """Jalankan target(shard) di num_workers proses dan gabungkan hasil serta lognya.
+
+    target harus fungsi level modul (atau functools.partial darinya) yang
+    menerima satu dict shard dan mengembalikan RunStats (trafgen_hist);
+    RunStats semua worker di-merge jadi satu.
+    """
+    shards = split_budget(num_requests, requests_per_second, num_workers, log_file, seed)
+    # TsvSink membuka part dengan mode append: sisa run yang crash jangan ikut di-merge
+    for shard in shards:
+        if os.path.exists(shard['log_file']):
+            os.remove(shard['log_file'])
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=get_context('fork')) as pool:
+        parts = list(pool.map(target, shards))
+
+    merge_logs([shard['log_file'] for shard in shards], log_file)
+    stats = RunStats()
+    for part in parts:
+        stats.merge(part)
+    return stats
@@ -0,0 +1,50 @@
+import numpy as np
+
+
+def zipf_mandelbrot(N, q, s):
+    ranks = np.arange(1, N + 1)
+    weights = (ranks + q) ** -s
+    probabilities = weights / weights.sum()
+    return probabilities
+
+
+class WeightedSampler:
+    """Iterator item dengan bobot tetap.
+
+    CDF dibangun sekali di awal, lalu indeks diambil per batch lewat
+    searchsorted, jadi biaya per request di loop dispatch cuma ambil satu
+    elemen list. seed membuat urutannya bisa diulang persis.
+    """
+
+    def __init__(self, items, weights, seed=None, batch_size=65536):
+        self.items = list(items)
+        self.cdf = np.cumsum(np.asarray(weights, dtype=float))
+        self.cdf /= self.cdf[-1]
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self._batch = []
+        self._pos = 0
+
+    def sample_indices(self, n):
+        indices = np.searchsorted(self.cdf, self.rng.random(n), side='right')
+        return np.minimum(indices, len(self.items) - 1)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._pos >= len(self._batch):
+            self._batch = self.sample_indices(self.batch_size).tolist()
+            self._pos = 0
+        index = self._batch[self._pos]
+        self._pos += 1
+        return self.items[index]
+
+
+class ZipfSampler(WeightedSampler):
+    """Iterator URL dengan distribusi Zipf-Mandelbrot (rank 1 = URL pertama)."""
+
+    def __init__(self, urls, q, s, seed=None, batch_size=65536):
+        urls = list(urls)
+        super().__init__(urls, zipf_mandelbrot(len(urls), q, s), seed, batch_size)
+        self.urls = self.items
@@ -1,54 +1,45 @@
-import subprocess
-import time
-from datetime import datetime
+import argparse
+from trafgen_icmp import IcmpProber
 
-def ping_with_interface(url, interface="uesimtun0", timeout=60):
-    """Ping URL with specified network interface."""
-    try:
-        start_time = datetime.now()
-        command = f"ping -I {interface} {url}"
-        print(f"Running command: {command}")
-
-        # Jalankan ping dengan timeout yang lebih lama
-        process = subprocess.run(
-            command, 
-            shell=True,  # Jalankan di shell agar bisa pakai interface
-            capture_output=True, 
-            text=True, 
-            timeout=timeout  # Timeout bisa disesuaikan
-        )
+def ping_with_interface(urls, interfaces=("uesimtun0",), interval=0.2, count=10, timeout=1.0):
+    """Ping semua urls dari semua interfaces sekaligus (IcmpProber dari trafgen_icmp, tanpa subprocess).
 
-        end_time = datetime.now()
-        rtt = (end_time - start_time).total_seconds() * 1000  # RTT dalam ms
-
-        if process.returncode == 0:
-            output = process.stdout
-            content_size = len(output.encode('utf-8'))  # Ukuran konten (bytes)
-            throughput = content_size / rtt if rtt > 0 else 0  # Throughput per ms
-            print(f"Ping Success: RTT = {rtt:.2f} ms, Content Size = {content_size} bytes, Throughput = {throughput:.2f} bytes/ms")
-            return 200, content_size, rtt, throughput
-        else:
-            print(f"Ping Failed: {process.stderr}")
-            return process.returncode, 0, rtt, 0
+    Hasil tiap paket dicetak begitu balasan datang atau timeout habis.
+    Mengembalikan ringkasan (loss, min/avg/max, p99, jitter) per pasangan
+    (interface, url).
+    """
+    prober = IcmpProber(urls, interfaces, interval=interval, count=count, timeout=timeout)
+    try:
+        for result in prober.probe():
+            rtt = f"RTT = {result.rtt_ms:.2f} ms" if result.rtt_ms is not None else "timeout"
+            print(f"[{result.sent:%H:%M:%S.%f}] {result.source} -> {result.target} seq={result.sequence} {rtt}")
+    finally:
+        prober.close()
 
-    except subprocess.TimeoutExpired:
-        print(f"Timeout expired for {url} after {timeout} seconds.")
-        return "Timeout", 0, 30000, 0  # Timeout error, bisa diatur sesuai kebutuhan
+    prober.print_summary()
+    return {pair: stats.summary() for pair, stats in prober.stats.items()}
 
 def main():
-    # URL yang ingin diuji
-    url = "testhtml5.vulnweb.com"  # Ganti dengan URL yang ingin kamu ping
-    interface = "uesimtun0"  # Interface jaringan yang digunakan
-    timeout = 60  # Timeout dalam detik
+    parser = argparse.ArgumentParser(description='Concurrent ICMP RTT, loss and jitter from one or more UE interfaces.')
+    parser.add_argument('-targets', nargs='+', default=['testhtml5.vulnweb.com'], help='Hosts or IPs to ping')
+    parser.add_argument('-I', '--interfaces', nargs='+', default=['uesimtun0'], help='Source interfaces or IPs (one per UE)')
+    parser.add_argument('-interval', type=float, default=0.2, help='Seconds between pings for each interface/target pair')
+    parser.add_argument('-count', type=int, default=10, help='Pings per interface/target pair')
+    parser.add_argument('-timeout', type=float, default=1.0, help='Seconds to wait for each reply')
+    args = parser.parse_args()
 
-    # Panggil fungsi untuk ping
-    status_code, content_size, rtt, throughput = ping_with_interface(url, interface, timeout)
+    try:
+        summaries = ping_with_interface(args.targets, args.interfaces, args.interval, args.count, args.timeout)
+    except ValueError as e:
+        parser.error(str(e))
 
     # Cek hasilnya
-    if status_code == 200:
-        print(f"Ping to {url} successful! RTT: {rtt:.2f} ms, Throughput: {throughput:.2f} bytes/ms")
-    else:
-        print(f"Ping to {url} failed with status: {status_code}.")
+    for (interface, url), summary in summaries.items():
+        if summary['received']:
+            print(f"Ping to {url} via {interface} successful! Avg RTT: {summary['avg_ms']:.2f} ms, "
+                  f"Loss: {summary['loss'] * 100:.1f}%, Jitter: {summary['jitter_ms']:.2f} ms")
+        else:
+            print(f"Ping to {url} via {interface} failed: no replies.")
 
 if __name__ == "__main__":
     main()